@@ -14,7 +14,7 @@ import re
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -37,17 +37,17 @@ class BaseBankFormatter(ABC):
         pass
     
     @abstractmethod
-    def get_date_patterns(self) -> List[str]:
+    def get_date_patterns(self) -> Sequence[str]:
         """Return list of date patterns specific to this bank"""
         pass
     
     @abstractmethod
-    def get_amount_patterns(self) -> List[str]:
+    def get_amount_patterns(self) -> Sequence[str]:
         """Return list of amount patterns specific to this bank"""
         pass
     
     @abstractmethod
-    def get_transaction_patterns(self) -> Dict[str, str]:
+    def get_transaction_patterns(self) -> Mapping[str, str]:
         """Return transaction parsing patterns specific to this bank"""
         pass
     
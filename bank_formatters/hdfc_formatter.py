@@ -19,11 +19,11 @@ Author: {BRAND_AUTHOR}
 """
 
 import re
-import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
+import orjson
 from brand_config import BRAND_NAME, BRAND_VERSION, BRAND_AUTHOR
 from .base_formatter import BaseBankFormatter
 
@@ -1049,8 +1049,8 @@ class TransactionFormatter(BaseBankFormatter):
         logger.info(f"Processing comprehensive file: {comprehensive_file_path}")
         
         # Load the comprehensive file
-        with open(comprehensive_file_path, 'r', encoding='utf-8') as f:
-            comprehensive_data = json.load(f)
+        with open(comprehensive_file_path, 'rb') as f:
+            comprehensive_data = orjson.loads(f.read())
         
         # Extract text content
         all_text = comprehensive_data.get('all_extracted_text', '')
@@ -1115,8 +1115,8 @@ class TransactionFormatter(BaseBankFormatter):
             clean_transactions = [formatted_data['formatted_transaction']]
         
         # Save clean transactions-only file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(clean_transactions, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(clean_transactions, option=orjson.OPT_INDENT_2))
         
         # Also generate CSV output
         csv_path = self.save_csv_file(comprehensive_file_path, clean_transactions)
@@ -1137,6 +1137,7 @@ class TransactionFormatter(BaseBankFormatter):
             Path to the generated CSV file
         """
         import csv
+        from io import StringIO
         
         # Generate CSV output path
         input_path = Path(comprehensive_file_path)
@@ -1153,26 +1154,28 @@ class TransactionFormatter(BaseBankFormatter):
             'closing_balance'
         ]
         
-        # Write CSV file
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-            
-            for transaction in transactions:
-                # Clean the transaction data for CSV
-                csv_row = {}
-                for header in headers:
-                    value = transaction.get(header, '')
-                    # Convert None to empty string and format numbers
-                    if value is None:
-                        csv_row[header] = ''
-                    elif header in ['debit_amount', 'credit_amount', 'closing_balance']:
-                        # Format numbers properly
-                        csv_row[header] = value if value else 0
-                    else:
-                        csv_row[header] = str(value)
-                
-                writer.writerow(csv_row)
+        # Build the CSV in memory and write it as UTF-8 bytes in one go
+        csv_buffer = StringIO(newline='')
+        writer = csv.DictWriter(csv_buffer, fieldnames=headers)
+        writer.writeheader()
+        
+        for transaction in transactions:
+            # Clean the transaction data for CSV
+            csv_row = {}
+            for header in headers:
+                value = transaction.get(header, '')
+                # Convert None to empty string and format numbers
+                if value is None:
+                    csv_row[header] = ''
+                elif header in ['debit_amount', 'credit_amount', 'closing_balance']:
+                    # Format numbers properly
+                    csv_row[header] = value if value else 0
+                else:
+                    csv_row[header] = str(value)
+            
+            writer.writerow(csv_row)
+        
+        Path(csv_path).write_bytes(csv_buffer.getvalue().encode('utf-8'))
         
         logger.info(f"Generated CSV file with {len(transactions)} transactions: {csv_path}")
         return csv_path
@@ -1414,4 +1417,4 @@ if __name__ == "__main__":
     result = formatter.format_transaction_data(sample_text)
     
     logger.info("Sample formatting result:")
-    logger.info(json.dumps(result, indent=2))
\ No newline at end of file
+    logger.info(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
\ No newline at end of file
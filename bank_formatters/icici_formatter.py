@@ -18,12 +18,75 @@ Author: CredNX Team
 
 import re
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Sequence
 from .base_formatter import BaseBankFormatter
 
 logger = logging.getLogger(__name__)
 
+# Multi-line column header repeated at the top of every ICICI statement page.
+# The trailing newline guarantees at least one line follows the header.
+ICICI_PAGE_HEADER = "DATE\nMODE**\nPARTICULARS\nDEPOSITS\nWITHDRAWALS\nBALANCE\n"
+
+# Line kinds produced by ICICIFormatter._classify_line
+LINE_EMPTY = 'EMPTY'
+LINE_PAGE = 'PAGE'
+LINE_DATE = 'DATE'
+LINE_TXID = 'TXID'
+LINE_AMOUNT = 'AMOUNT'
+LINE_TEXT = 'TEXT'
+
+# Single compiled alternation that classifies a stripped statement line in one
+# match. Alternatives are tried in priority order:
+# - PAGE:   "Page x of y" anywhere in the line
+# - DATE:   line starts with DD-MM-YYYY
+# - TXID:   4-12 plain digits (transaction reference, not an amount)
+# - TEXT:   13+ plain digits (too long to be an unformatted amount)
+# - AMOUNT: 5000.0, 78,410.00, 1,71,908.86 ...
+# Anything that doesn't match is TEXT.
+LINE_TOKEN_RE = re.compile(
+    r'(?P<PAGE>(?=.*?Page \d+ of \d+))'
+    r'|(?P<DATE>\d{2}-\d{2}-\d{4})'
+    r'|(?P<TXID>\d{4,12}$)'
+    r'|(?P<TEXT>\d{13,}$)'
+    r'|(?P<AMOUNT>\d+(?:,\d{2,3})*(?:\.\d{1,2})?$)'
+)
+
+
+@dataclass
+class ICICITransaction:
+    """
+    Internal record for a parsed ICICI transaction.
+    
+    Uses __slots__ so large statements with thousands of transactions
+    don't carry a per-transaction dict. Converted back to plain dicts
+    only at the public API boundary.
+    """
+    __slots__ = (
+        'date', 'mode', 'particulars', 'deposits', 'withdrawals', 'balance',
+        'amount', 'type', 'bank', 'narration', '_next_line', 'page', '_original_order'
+    )
+    
+    date: str
+    mode: str
+    particulars: str
+    deposits: float
+    withdrawals: float
+    balance: float
+    amount: float
+    type: str
+    bank: str
+    narration: str
+    _next_line: int
+    page: int
+    _original_order: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the transaction as a plain dictionary"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 class ICICIFormatter(BaseBankFormatter):
     """
     ICICI Bank statement formatter.
@@ -41,27 +104,36 @@ class ICICIFormatter(BaseBankFormatter):
     - Clean 6-column output (date, mode, particulars, deposits, withdrawals, balance)
     """
     
+    # Static format description, shared by every instance (no per-call allocation)
+    BANK_NAME = "ICICI"
+    
+    DATE_PATTERNS = (
+        r'\d{2}-\d{2}-\d{4}',  # DD-MM-YYYY (ICICI format)
+        r'\d{1,2}-\d{1,2}-\d{4}',  # D-M-YYYY
+    )
+    
+    AMOUNT_PATTERNS = (
+        r'(\d+(?:,\d{3})*(?:\.\d{2})?)',  # 1,000.00 or 1000.00
+    )
+    
+    TRANSACTION_PATTERNS = MappingProxyType({
+        "header_pattern": r'DATE\s+MODE\*\*\s+PARTICULARS\s+DEPOSITS\s+WITHDRAWALS\s+BALANCE',
+        "transaction_line": r'(\d{2}-\d{2}-\d{4})\s+([^\s]+)\s+(.+?)\s+(\d+(?:,\d{3})*(?:\.\d{2})?)\s+(\d+(?:,\d{3})*(?:\.\d{2})?)\s+(\d+(?:,\d{3})*(?:\.\d{2})?)',
+        "page_end_pattern": r'Page \d+ of \d+',
+        "mode_types": r'(B/F|NEFT|IMPS|UPI|ATM|POS|TRANSFER|PAYMENT|CHEQUE|ECS|DD|RTGS)',
+    })
+    
     def get_bank_name(self) -> str:
-        return "ICICI"
+        return self.BANK_NAME
     
-    def get_date_patterns(self) -> List[str]:
-        return [
-            r'\d{2}-\d{2}-\d{4}',  # DD-MM-YYYY (ICICI format)
-            r'\d{1,2}-\d{1,2}-\d{4}',  # D-M-YYYY
-        ]
+    def get_date_patterns(self) -> Sequence[str]:
+        return self.DATE_PATTERNS
     
-    def get_amount_patterns(self) -> List[str]:
-        return [
-            r'(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)',  # 1,000.00 or 1000.00
-        ]
+    def get_amount_patterns(self) -> Sequence[str]:
+        return self.AMOUNT_PATTERNS
     
-    def get_transaction_patterns(self) -> Dict[str, str]:
-        return {
-            "header_pattern": r'DATE\\s+MODE\\*\\*\\s+PARTICULARS\\s+DEPOSITS\\s+WITHDRAWALS\\s+BALANCE',
-            "transaction_line": r'(\\d{2}-\\d{2}-\\d{4})\\s+([^\\s]+)\\s+(.+?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)',
-            "page_end_pattern": r'Page \d+ of \d+',
-            "mode_types": r'(B/F|NEFT|IMPS|UPI|ATM|POS|TRANSFER|PAYMENT|CHEQUE|ECS|DD|RTGS)',
-        }
+    def get_transaction_patterns(self) -> Mapping[str, str]:
+        return self.TRANSACTION_PATTERNS
     
     def validate_statement(self, extracted_text: str) -> bool:
         """Validate ICICI statement format"""
@@ -82,6 +154,10 @@ class ICICIFormatter(BaseBankFormatter):
         Parse ICICI bank statement format with proper column structure
         Handles multi-page statements with headers on each page
         """
+        return [tx.to_dict() for tx in self._parse_transactions(extracted_text)]
+    
+    def _parse_transactions(self, extracted_text: str) -> List[ICICITransaction]:
+        """Parse ICICI statement text into internal transaction records"""
         logger.info("Parsing ICICI bank statement format")
         
         transactions = []
@@ -106,7 +182,7 @@ class ICICIFormatter(BaseBankFormatter):
         
         # Sort transactions by date, but maintain original order within same date
         # This ensures transactions on the same date appear in the correct chronological order
-        transactions.sort(key=lambda x: (self._parse_date(x['date']), x.get('_original_order', 0)))
+        transactions.sort(key=lambda x: (self._parse_date(x.date), x._original_order))
         
         # Apply balance equation logic to determine credit/debit
         transactions = self._apply_balance_equation_logic(transactions)
@@ -152,64 +228,61 @@ class ICICIFormatter(BaseBankFormatter):
         if 1 in page_sections:
             first_page_marker_line = self._find_first_page_marker_line(lines)
             if first_page_marker_line > 0:
-                # Merge pre-page content into page 1
-                pre_page_content = lines[:first_page_marker_line]
+                # Merge pre-page content into page 1 (stripped like the rest of the page)
+                pre_page_content = [line.strip() for line in lines[:first_page_marker_line]]
                 page_1_content = page_sections[1]
                 page_sections[1] = pre_page_content + page_1_content
                 logger.info(f"Merged pre-page content ({len(pre_page_content)} lines) into page 1")
         
         return page_sections
     
-    def _parse_icici_page(self, page_lines: List[str], page_num: int, global_transaction_order: int = 0) -> List[Dict[str, Any]]:
+    def _parse_icici_page(self, page_lines: List[str], page_num: int, global_transaction_order: int = 0) -> List[ICICITransaction]:
         """Parse a single ICICI page for transactions"""
         transactions = []
         
-        # Find the header (ICICI uses multi-line headers)
-        header_found = False
-        data_start_idx = -1
-        
-        for i, line in enumerate(page_lines):
-            line = line.strip()
-            if line == 'DATE':
-                # Check if next lines contain the header
-                if (i + 5 < len(page_lines) and 
-                    page_lines[i + 1].strip() == 'MODE**' and
-                    page_lines[i + 2].strip() == 'PARTICULARS' and
-                    page_lines[i + 3].strip() == 'DEPOSITS' and
-                    page_lines[i + 4].strip() == 'WITHDRAWALS' and
-                    page_lines[i + 5].strip() == 'BALANCE'):
-                    header_found = True
-                    data_start_idx = i + 6  # Start after the header
-                    break
+        # Find the header (ICICI uses multi-line headers) with a single substring
+        # scan over the joined page text instead of comparing line by line
+        page_blob = '\n'.join(page_lines)
+        idx = page_blob.find(ICICI_PAGE_HEADER)
+        while idx > 0 and page_blob[idx - 1] != '\n':
+            # Match must start at a line boundary
+            idx = page_blob.find(ICICI_PAGE_HEADER, idx + 1)
         
-        if not header_found:
+        if idx == -1:
             logger.warning(f"No ICICI header found on page {page_num}")
             return transactions
         
+        data_start_idx = page_blob.count('\n', 0, idx) + 6  # Start after the header
+        
+        # Classify every data line once; the transaction state machine below
+        # then dispatches on the line kind instead of re-running regexes
+        line_kinds = [LINE_EMPTY] * data_start_idx
+        line_kinds.extend(self._classify_line(line) for line in page_lines[data_start_idx:])
+        
         # Parse transaction lines (ICICI format: each transaction spans multiple lines)
         i = data_start_idx
         page_transaction_order = 0  # Order within this page
         while i < len(page_lines):
-            line = page_lines[i].strip()
-            if not line:
+            kind = line_kinds[i]
+            if kind == LINE_EMPTY:
                 i += 1
                 continue
             
             # Skip if this is a page end marker
-            if re.search(r'Page \d+ of \d+', line):
+            if kind == LINE_PAGE:
                 break
             
             # Check if this looks like a transaction start (date pattern)
-            if re.match(r'\d{2}-\d{2}-\d{4}', line):
+            if kind == LINE_DATE:
                 # This is the start of a transaction
-                transaction = self._parse_icici_transaction_multiline(page_lines, i)
+                transaction = self._parse_icici_transaction_multiline(page_lines, i, line_kinds)
                 if transaction:
-                    transaction['page'] = page_num
-                    transaction['_original_order'] = global_transaction_order + page_transaction_order
+                    transaction.page = page_num
+                    transaction._original_order = global_transaction_order + page_transaction_order
                     transactions.append(transaction)
                     page_transaction_order += 1
                     # Move to next transaction
-                    i = transaction.get('_next_line', i + 1)
+                    i = transaction._next_line
                 else:
                     i += 1
             else:
@@ -224,10 +297,7 @@ class ICICIFormatter(BaseBankFormatter):
         # Example: 17-09-2024 B/F 93,498.86
         
         # Try to match the full 6-column format
-        full_match = re.search(
-            r'(\\d{2}-\\d{2}-\\d{4})\\s+([^\\s]+)\\s+(.+?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)',
-            line
-        )
+        full_match = re.search(self.TRANSACTION_PATTERNS["transaction_line"], line)
         
         if full_match:
             date_str, mode, particulars, deposits_str, withdrawals_str, balance_str = full_match.groups()
@@ -264,7 +334,7 @@ class ICICIFormatter(BaseBankFormatter):
         
         # Try simpler format for cases where columns might be merged
         simple_match = re.search(
-            r'(\\d{2}-\\d{2}-\\d{4})\\s+([^\\s]+)\\s+(.+?)\\s+(\\d+(?:,\\d{3})*(?:\\.\\d{2})?)',
+            r'(\d{2}-\d{2}-\d{4})\s+([^\s]+)\s+(.+?)\s+(\d+(?:,\d{3})*(?:\.\d{2})?)',
             line
         )
         
@@ -296,7 +366,27 @@ class ICICIFormatter(BaseBankFormatter):
         
         return None
     
-    def _parse_icici_transaction_multiline(self, page_lines: List[str], start_idx: int) -> Optional[Dict[str, Any]]:
+    def _classify_line(self, line: str) -> str:
+        """
+        Classify a statement line with a single regex match.
+        
+        Equivalent to checking, in order, the page-marker pattern, the date
+        pattern, _is_transaction_id and _is_amount_line.
+        
+        Args:
+            line: The line to classify
+            
+        Returns:
+            One of the LINE_* kinds
+        """
+        line = line.strip()
+        if not line:
+            return LINE_EMPTY
+        
+        match = LINE_TOKEN_RE.match(line)
+        return match.lastgroup if match else LINE_TEXT
+    
+    def _parse_icici_transaction_multiline(self, page_lines: List[str], start_idx: int, line_kinds: List[str]) -> Optional[ICICITransaction]:
         """Parse ICICI transaction with smart variable-length handling"""
         try:
             if start_idx >= len(page_lines):
@@ -310,55 +400,46 @@ class ICICIFormatter(BaseBankFormatter):
             
             # Look for mode lines (non-amount lines after date)
             while i < len(page_lines):
-                line = page_lines[i].strip()
-                if not line:
+                kind = line_kinds[i]
+                if kind == LINE_EMPTY:
                     i += 1
                     continue
                 
-                # Skip if this is a page end marker
-                if re.search(r'Page \d+ of \d+', line):
-                    break
-                
-                # Skip if this is a new date (start of next transaction)
-                if re.match(r'\d{2}-\d{2}-\d{4}', line):
-                    break
-                
-                # Check if this line contains an amount (deposits/withdrawals/balance)
-                if self._is_amount_line(line):
+                # Stop at a page end marker, a new date (start of next
+                # transaction) or an amount (deposits/withdrawals/balance)
+                if kind == LINE_PAGE or kind == LINE_DATE or kind == LINE_AMOUNT:
                     break
                 
                 # This is part of the mode
-                mode_lines.append(line)
+                mode_lines.append(page_lines[i].strip())
                 i += 1
             
-            mode = ' '.join(mode_lines).strip()
+            # Mode lines are already stripped and non-empty, so the common
+            # single-line case needs no join
+            if len(mode_lines) == 1:
+                mode = mode_lines[0]
+            else:
+                mode = ' '.join(mode_lines)
             
             # Now look for amounts (deposits, withdrawals, balance)
             amounts = []
             while i < len(page_lines):
-                line = page_lines[i].strip()
-                if not line:
+                kind = line_kinds[i]
+                if kind == LINE_EMPTY:
                     i += 1
                     continue
                 
-                # Skip if this is a page end marker
-                if re.search(r'Page \d+ of \d+', line):
-                    break
-                
-                # Skip if this is a new date (start of next transaction)
-                if re.match(r'\d{2}-\d{2}-\d{4}', line):
-                    break
-                
                 # Check if this line contains an amount
-                if self._is_amount_line(line):
-                    amounts.append(line)
+                if kind == LINE_AMOUNT:
+                    amounts.append(page_lines[i].strip())
                     i += 1
-                elif self._is_transaction_id(line):
+                elif kind == LINE_TXID:
                     # Skip transaction ID lines (like 3746, 8552, 7507574)
                     i += 1
                     continue
                 else:
-                    # Non-amount line, might be part of mode continuation
+                    # Page end marker, new date, or non-amount line that
+                    # might be part of mode continuation
                     break
             
             # Parse amounts based on ICICI format using balance equation logic
@@ -407,19 +488,21 @@ class ICICIFormatter(BaseBankFormatter):
             # Extract clean mode from the full mode string
             clean_mode = self._extract_icici_mode(mode)
             
-            transaction = {
-                "date": date_str,
-                "mode": clean_mode,
-                "particulars": mode,  # Full mode string becomes particulars
-                "deposits": deposits,
-                "withdrawals": withdrawals,
-                "balance": balance,
-                "amount": amount,
-                "type": transaction_type,
-                "bank": "ICICI",
-                "narration": mode,
-                "_next_line": i
-            }
+            transaction = ICICITransaction(
+                date=date_str,
+                mode=clean_mode,
+                particulars=mode,  # Full mode string becomes particulars
+                deposits=deposits,
+                withdrawals=withdrawals,
+                balance=balance,
+                amount=amount,
+                type=transaction_type,
+                bank="ICICI",
+                narration=mode,
+                _next_line=i,
+                page=0,
+                _original_order=0
+            )
             
             return transaction
             
@@ -443,20 +526,9 @@ class ICICIFormatter(BaseBankFormatter):
         """
         line = line.strip()
         
-        # Transaction IDs are pure numbers without commas or decimals
-        # They can be various lengths but are typically 4-12 digits
-        if re.match(r'^\d+$', line):
-            # Must not contain letters or special characters
-            if re.search(r'[a-zA-Z]', line):
-                return False
-            if re.search(r'[/\\\\@#]', line):
-                return False
-            
-            # Transaction IDs are typically 4-12 digits without formatting
-            if 4 <= len(line) <= 12 and ',' not in line and '.' not in line:
-                return True
-        
-        return False
+        # Transaction IDs are pure numbers without commas or decimals,
+        # typically 4-12 digits (isdigit already rules out letters, ',' and '.')
+        return line.isdigit() and 4 <= len(line) <= 12
     
     def _is_amount_line(self, line: str) -> bool:
         """
@@ -485,15 +557,8 @@ class ICICIFormatter(BaseBankFormatter):
         # Allow 1 or 2 decimal places
         amount_pattern = r'^\d+(?:,\d{2,3})*(?:\.\d{1,2})?$'
         
-        # Additional checks to avoid false positives
+        # The anchored pattern already rules out letters and special characters
         if re.match(amount_pattern, line):
-            # Must not contain letters or special characters (except commas and decimal)
-            if re.search(r'[a-zA-Z]', line):
-                return False
-            # Must not contain slashes or other special characters
-            if re.search(r'[/\\@#]', line):
-                return False
-            
             # Specific check for transaction IDs: reject pure numbers that are likely transaction IDs
             # Reject 5-digit numbers without formatting (like 57065)
             # Reject 9-digit numbers without formatting (like 770593868)
@@ -513,7 +578,7 @@ class ICICIFormatter(BaseBankFormatter):
         except ValueError:
             return None
     
-    def _apply_balance_equation_logic(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _apply_balance_equation_logic(self, transactions: List[ICICITransaction]) -> List[ICICITransaction]:
         """
         Apply balance equation logic: Previous Balance + Credit - Debit = Next Balance
         to determine whether amounts are credits or debits
@@ -526,16 +591,16 @@ class ICICIFormatter(BaseBankFormatter):
         
         for i, tx in enumerate(transactions):
             # Skip B/F transactions as they set the initial balance
-            if tx['mode'] == 'B/F' or tx['mode'] == '' and 'B/F' in tx['particulars']:
-                current_balance = tx['balance']
-                tx['deposits'] = 0.0
-                tx['withdrawals'] = 0.0
+            if tx.mode == 'B/F' or tx.mode == '' and 'B/F' in tx.particulars:
+                current_balance = tx.balance
+                tx.deposits = 0.0
+                tx.withdrawals = 0.0
                 continue
             
             # For transactions with amounts, determine credit/debit using balance equation
-            if tx['deposits'] > 0:  # Temporary assignment from parsing
-                amount = tx['deposits']
-                next_balance = tx['balance']
+            if tx.deposits > 0:  # Temporary assignment from parsing
+                amount = tx.deposits
+                next_balance = tx.balance
                 
                 # Calculate what the balance should be if this is a credit
                 expected_balance_if_credit = current_balance + amount
@@ -545,22 +610,22 @@ class ICICIFormatter(BaseBankFormatter):
                 
                 # Check which calculation matches the actual next balance
                 if abs(expected_balance_if_credit - next_balance) < 0.01:  # Credit
-                    tx['deposits'] = amount
-                    tx['withdrawals'] = 0.0
+                    tx.deposits = amount
+                    tx.withdrawals = 0.0
                 elif abs(expected_balance_if_debit - next_balance) < 0.01:  # Debit
-                    tx['deposits'] = 0.0
-                    tx['withdrawals'] = amount
+                    tx.deposits = 0.0
+                    tx.withdrawals = amount
                 else:
                     # If neither matches exactly, use the closer one
                     credit_diff = abs(expected_balance_if_credit - next_balance)
                     debit_diff = abs(expected_balance_if_debit - next_balance)
                     
                     if credit_diff < debit_diff:
-                        tx['deposits'] = amount
-                        tx['withdrawals'] = 0.0
+                        tx.deposits = amount
+                        tx.withdrawals = 0.0
                     else:
-                        tx['deposits'] = 0.0
-                        tx['withdrawals'] = amount
+                        tx.deposits = 0.0
+                        tx.withdrawals = amount
                 
                 # Update current balance for next transaction
                 current_balance = next_balance
@@ -634,7 +699,7 @@ class ICICIFormatter(BaseBankFormatter):
         logger.info("Formatting ICICI transactions")
         
         # Parse transactions using existing logic
-        transactions = self.parse_statement_format(extracted_text)
+        transactions = self._parse_transactions(extracted_text)
         
         if not transactions:
             logger.warning("No transactions found in ICICI statement")
@@ -651,12 +716,12 @@ class ICICIFormatter(BaseBankFormatter):
         clean_transactions = []
         for tx in transactions:
             clean_tx = {
-                'date': tx.get('date', ''),
-                'mode': tx.get('mode', ''),
-                'particulars': tx.get('particulars', ''),
-                'deposits': tx.get('deposits', 0.0),
-                'withdrawals': tx.get('withdrawals', 0.0),
-                'balance': tx.get('balance', 0.0)
+                'date': tx.date,
+                'mode': tx.mode,
+                'particulars': tx.particulars,
+                'deposits': tx.deposits,
+                'withdrawals': tx.withdrawals,
+                'balance': tx.balance
             }
             clean_transactions.append(clean_tx)
         
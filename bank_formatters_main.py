@@ -10,11 +10,20 @@ Author: CredNX Team
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+import re
+from typing import Callable, Dict, List, Any, Optional
 from bank_formatters import HDFCFormatter, ICICIFormatter, BaseBankFormatter
 
 logger = logging.getLogger(__name__)
 
+# Bank indicators in detection priority order. Matching is case-insensitive,
+# so longer forms such as "HDFC BANK" are already covered by "HDFC".
+BANK_INDICATOR_PATTERNS = (
+    ("HDFC", re.compile(r"HDFC", re.IGNORECASE)),
+    ("ICICI", re.compile(r"ICICI", re.IGNORECASE)),
+    ("SBI", re.compile(r"STATE BANK OF INDIA|SBI", re.IGNORECASE)),
+)
+
 class BankFormatterFactory:
     """
     Factory class to create bank-specific formatters
@@ -25,6 +34,10 @@ class BankFormatterFactory:
         "ICICI": ICICIFormatter,
     }
     
+    # Formatters hold no per-statement state, so one instance per bank is
+    # shared. Keyed by the name as passed in and by its upper-case form.
+    _instances: Dict[str, BaseBankFormatter] = {}
+    
     @classmethod
     def get_formatter(cls, bank_name: str) -> BaseBankFormatter:
         """
@@ -34,19 +47,43 @@ class BankFormatterFactory:
             bank_name: Name of the bank (case-insensitive)
             
         Returns:
-            Bank-specific formatter instance
+            Bank-specific formatter instance (shared between calls)
             
         Raises:
             ValueError: If bank_name is not supported
         """
+        formatter = cls._instances.get(bank_name)
+        if formatter is not None:
+            return formatter
+        
         bank_name_upper = bank_name.upper()
         
         if bank_name_upper not in cls._formatters:
             supported_banks = list(cls._formatters.keys())
             raise ValueError(f"Unsupported bank: {bank_name}. Supported banks: {supported_banks}")
         
-        formatter_class = cls._formatters[bank_name_upper]
-        return formatter_class()
+        formatter = cls._instances.get(bank_name_upper)
+        if formatter is None:
+            formatter = cls._formatters[bank_name_upper]()
+            cls._instances[bank_name_upper] = formatter
+        cls._instances[bank_name] = formatter
+        return formatter
+    
+    @classmethod
+    def get_format_function(cls, bank_name: str) -> Callable[[str], Dict[str, Any]]:
+        """
+        Get the bound format_transactions function for the specified bank
+        
+        Args:
+            bank_name: Name of the bank (case-insensitive)
+            
+        Returns:
+            Callable taking extracted text and returning the formatted result
+            
+        Raises:
+            ValueError: If bank_name is not supported
+        """
+        return cls.get_formatter(bank_name).format_transactions
     
     @classmethod
     def get_supported_banks(cls) -> List[str]:
@@ -68,6 +105,7 @@ class BankFormatterFactory:
             formatter_class: Formatter class that extends BaseBankFormatter
         """
         cls._formatters[bank_name.upper()] = formatter_class
+        cls._instances.clear()
 
 
 
@@ -75,22 +113,17 @@ def auto_detect_bank(extracted_text: str) -> Optional[str]:
     """
     Automatically detect the bank from extracted text
     
+    Banks are tried in BANK_INDICATOR_PATTERNS order over the whole text, so
+    an HDFC statement that mentions ICICI (e.g. in a transfer) is still HDFC.
+    
     Args:
         extracted_text: Raw text extracted from PDF
         
     Returns:
         Bank name if detected, None otherwise
     """
-    text_upper = extracted_text.upper()
-    
-    bank_indicators = {
-        "HDFC": ["HDFC BANK", "HDFC Bank", "HDFC"],
-        "ICICI": ["ICICI BANK", "ICICI Bank", "ICICI"],
-        "SBI": ["STATE BANK OF INDIA", "SBI"],
-    }
-    
-    for bank_name, indicators in bank_indicators.items():
-        if any(indicator in text_upper for indicator in indicators):
+    for bank_name, pattern in BANK_INDICATOR_PATTERNS:
+        if pattern.search(extracted_text):
             return bank_name
     
     return None
@@ -3,32 +3,96 @@ Configuration file for BankParser ePDF processing
 """
 
 import os
-from typing import Optional
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def _str(value: Optional[str]) -> str:
+    """Parse a setting that has a default"""
+    return value or ''
+
+
+def _optional_str(value: Optional[str]) -> Optional[str]:
+    """Parse a setting that is None when unset"""
+    return value
+
+
+def _int(value: Optional[str]) -> int:
+    """Parse an integer setting"""
+    return int(value or '')
+
+
+def _bool(value: Optional[str]) -> bool:
+    """Parse a 'true'/'false' setting"""
+    return (value or '').lower() == 'true'
+
+
+class _EnvSetting(Generic[T]):
+    """
+    Config setting read from the environment variable of the same name on
+    first access and cached afterwards, so nothing is parsed at import time
+    """
+    
+    def __init__(self, default: Optional[str], parser: Callable[[Optional[str]], T]) -> None:
+        self.default = default
+        self.parser = parser
+        self.name = ''
+        self._value: Optional[T] = None
+        self._resolved = False
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance: Any, owner: Any = None) -> T:
+        if not self._resolved:
+            self._value = self.parser(os.getenv(self.name, self.default))
+            self._resolved = True
+        return self._value  # type: ignore[return-value]
+    
+    def reset(self) -> None:
+        """Forget the cached value so the next access reads the environment again"""
+        self._resolved = False
+
 
 class Config:
     """Configuration class for BankParser ePDF processing"""
     
     # AWS Configuration
-    AWS_ACCESS_KEY_ID: Optional[str] = os.getenv('AWS_ACCESS_KEY_ID')
-    AWS_SECRET_ACCESS_KEY: Optional[str] = os.getenv('AWS_SECRET_ACCESS_KEY')
-    AWS_REGION: str = os.getenv('AWS_REGION', 'us-east-1')
+    AWS_ACCESS_KEY_ID = _EnvSetting(None, _optional_str)
+    AWS_SECRET_ACCESS_KEY = _EnvSetting(None, _optional_str)
+    AWS_REGION = _EnvSetting('us-east-1', _str)
     
     # S3 Configuration
-    S3_BUCKET_NAME: str = os.getenv('S3_BUCKET_NAME', 'your-s3-bucket-name')
-    S3_EPDF_PREFIX: str = os.getenv('S3_EPDF_PREFIX', 'epdfs/')  # Prefix for ePDF files in S3
+    S3_BUCKET_NAME = _EnvSetting('your-s3-bucket-name', _str)
+    S3_EPDF_PREFIX = _EnvSetting('epdfs/', _str)  # Prefix for ePDF files in S3
     
     # Processing Configuration
-    MAX_FILE_SIZE_MB: int = int(os.getenv('MAX_FILE_SIZE_MB', '100'))
-    EXTRACTION_TIMEOUT_SECONDS: int = int(os.getenv('EXTRACTION_TIMEOUT_SECONDS', '300'))
+    MAX_FILE_SIZE_MB = _EnvSetting('100', _int)
+    EXTRACTION_TIMEOUT_SECONDS = _EnvSetting('300', _int)
+    EXTRACTION_CACHE_DIR = _EnvSetting(None, _optional_str)  # Unset disables the extraction cache
+    EXTRACTION_CACHE_TTL_SECONDS = _EnvSetting('86400', _int)
+    SESSION_CACHE_DIR = _EnvSetting(None, _optional_str)  # Unset disables the local session results cache
+    S3_BODY_CACHE_MB = _EnvSetting('0', _int)  # Downloaded ePDFs kept in memory; 0 disables the cache
     
     # Output Configuration
-    OUTPUT_DIRECTORY: str = os.getenv('OUTPUT_DIRECTORY', './output')
-    SAVE_INDIVIDUAL_PAGES: bool = os.getenv('SAVE_INDIVIDUAL_PAGES', 'false').lower() == 'true'
+    OUTPUT_DIRECTORY = _EnvSetting('./output', _str)
+    SAVE_INDIVIDUAL_PAGES = _EnvSetting('false', _bool)
+    COMPRESS_RESULTS = _EnvSetting('false', _bool)  # Compact, gzipped local results files
+    EXTRACT_IMAGES = _EnvSetting('true', _bool)  # Per-page image info in local results
+    LEGACY_OUTPUT = _EnvSetting('false', _bool)  # Results in the schema version 1 layout
     
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL = _EnvSetting('INFO', _str)
     LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    @classmethod
+    def reload(cls) -> None:
+        """Re-read every setting from the environment on its next access"""
+        for setting in vars(cls).values():
+            if isinstance(setting, _EnvSetting):
+                setting.reset()
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration"""
@@ -50,7 +114,7 @@ class Config:
         return True
     
     @classmethod
-    def print_config(cls):
+    def print_config(cls) -> None:
         """Print current configuration (without sensitive data)"""
         print("BankParser Configuration:")
         print("-" * 30)
@@ -59,5 +123,11 @@ class Config:
         print(f"S3 ePDF Prefix: {cls.S3_EPDF_PREFIX}")
         print(f"Max File Size: {cls.MAX_FILE_SIZE_MB} MB")
         print(f"Output Directory: {cls.OUTPUT_DIRECTORY}")
+        print(f"Compress Results: {cls.COMPRESS_RESULTS}")
+        print(f"Extract Images: {cls.EXTRACT_IMAGES}")
+        print(f"Legacy Output: {cls.LEGACY_OUTPUT}")
+        print(f"Extraction Cache: {cls.EXTRACTION_CACHE_DIR or 'Disabled'}")
+        print(f"Session Cache: {cls.SESSION_CACHE_DIR or 'Disabled'}")
+        print(f"S3 Body Cache: {f'{cls.S3_BODY_CACHE_MB} MB' if cls.S3_BODY_CACHE_MB else 'Disabled'}")
         print(f"Log Level: {cls.LOG_LEVEL}")
         print(f"AWS Credentials: {'Configured' if cls.AWS_ACCESS_KEY_ID else 'Not Configured'}")
@@ -19,10 +19,12 @@ Options:
 import os
 import sys
 import argparse
+import importlib.util
 import logging
 from pathlib import Path
 import json
 import subprocess
+import tempfile
 from brand_config import BRAND_NAME, BRAND_VERSION, BRAND_AUTHOR
 
 # Format the docstring with brand config
@@ -56,24 +58,25 @@ class BSAParserDeployer:
             logger.error("❌ Python 3.8 or higher is required")
             return False
         
-        logger.info(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detected")
+        logger.info("✅ Python %s.%s detected", sys.version_info.major, sys.version_info.minor)
         
         # Check required packages
         required_packages = [
-            'fitz', 'pdfplumber', 'PyPDF2', 'pandas', 'numpy'
+            'fitz', 'pdfplumber', 'PyPDF2'
         ]
         
+        # find_spec only consults the import finders, it doesn't execute the
+        # (slow) top-level code of each package
         missing_packages = []
         for package in required_packages:
-            try:
-                __import__(package)
-                logger.info(f"✅ {package} is installed")
-            except ImportError:
+            if importlib.util.find_spec(package) is not None:
+                logger.info("✅ %s is installed", package)
+            else:
                 missing_packages.append(package)
-                logger.error(f"❌ {package} is missing")
+                logger.error("❌ %s is missing", package)
         
         if missing_packages:
-            logger.error(f"❌ Missing packages: {', '.join(missing_packages)}")
+            logger.error("❌ Missing packages: %s", ', '.join(missing_packages))
             logger.info("💡 Run: pip install -r requirements.txt")
             return False
         
@@ -87,17 +90,17 @@ class BSAParserDeployer:
         try:
             # Create BSA folder
             self.bsa_folder.mkdir(parents=True, exist_ok=True)
-            logger.info(f"✅ Created BSA folder: {self.bsa_folder}")
+            logger.info("✅ Created BSA folder: %s", self.bsa_folder)
             
             # Create example session
             example_session = self.bsa_folder / "session_001"
             example_session.mkdir(parents=True, exist_ok=True)
-            logger.info(f"✅ Created example session: {example_session}")
+            logger.info("✅ Created example session: %s", example_session)
             
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to create directory structure: {e}")
+            logger.error("❌ Failed to create directory structure: %s", e)
             return False
     
     def create_config_file(self) -> bool:
@@ -113,6 +116,7 @@ Configuration settings for the {BRAND_NAME} ePDF processing system.
 """
 
 import os
+import re
 from pathlib import Path
 
 class Config:
@@ -132,10 +136,15 @@ class Config:
     
     # Validation settings
     MIN_TEXT_LENGTH = 100
-    TRANSACTION_KEYWORDS = [
+    TRANSACTION_KEYWORDS = frozenset({{
         'transaction', 'date', 'amount', 'balance', 'debit', 'credit',
         'narration', 'reference', 'upi', 'neft', 'imps'
-    ]
+    }})
+    # Matches any transaction keyword as a whole word in a single pass
+    TRANSACTION_KEYWORDS_RE = re.compile(
+        r'\\b(?:transaction|date|amount|balance|debit|credit|narration|reference|upi|neft|imps)\\b',
+        re.IGNORECASE
+    )
     
     # Output settings
     OUTPUT_FORMAT = 'json'
@@ -151,13 +160,31 @@ class Config:
 '''
         
         try:
-            with open('config.py', 'w') as f:
-                f.write(config_content)
+            new_content = config_content.encode()
+            
+            # Leave an identical config.py untouched so repeated deploys
+            # don't rewrite it and invalidate its bytecode cache
+            if os.path.exists('config.py'):
+                with open('config.py', 'rb') as f:
+                    if f.read() == new_content:
+                        logger.info("✅ config.py unchanged")
+                        return True
+            
+            # Write to a temporary file and swap it in atomically
+            fd, tmp_path = tempfile.mkstemp(dir='.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(new_content)
+                os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+                os.replace(tmp_path, 'config.py')
+            except Exception:
+                os.unlink(tmp_path)
+                raise
             logger.info("✅ Created config.py")
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to create config.py: {e}")
+            logger.error("❌ Failed to create config.py: %s", e)
             return False
     
     def create_example_session(self) -> bool:
@@ -199,7 +226,7 @@ This is an example session folder for {BRAND_NAME} ePDF processing.
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to create example session: {e}")
+            logger.error("❌ Failed to create example session: %s", e)
             return False
     
     def run_system_test(self) -> bool:
@@ -221,18 +248,18 @@ This is an example session folder for {BRAND_NAME} ePDF processing.
             
             # Test session listing
             sessions = processor.list_all_sessions()
-            logger.info(f"✅ Found {len(sessions)} sessions")
+            logger.info("✅ Found %d sessions", len(sessions))
             
             logger.info("✅ System test passed")
             return True
             
         except Exception as e:
-            logger.error(f"❌ System test failed: {e}")
+            logger.error("❌ System test failed: %s", e)
             return False
     
     def deploy(self, create_example: bool = False) -> bool:
         """Deploy the BSAParser system"""
-        logger.info(f"🚀 Starting {BRAND_NAME} deployment...")
+        logger.info("🚀 Starting %s deployment...", BRAND_NAME)
         
         steps = [
             ("Environment validation", self.validate_environment),
@@ -245,15 +272,15 @@ This is an example session folder for {BRAND_NAME} ePDF processing.
             steps.append(("Example session creation", self.create_example_session))
         
         for step_name, step_func in steps:
-            logger.info(f"📋 {step_name}...")
+            logger.info("📋 %s...", step_name)
             if not step_func():
-                logger.error(f"❌ Deployment failed at: {step_name}")
+                logger.error("❌ Deployment failed at: %s", step_name)
                 return False
-            logger.info(f"✅ {step_name} completed")
+            logger.info("✅ %s completed", step_name)
         
-        logger.info(f"🎉 {BRAND_NAME} deployment completed successfully!")
-        logger.info(f"📁 BSA folder: {self.bsa_folder}")
-        logger.info(f"📝 Log level: {self.log_level}")
+        logger.info("🎉 %s deployment completed successfully!", BRAND_NAME)
+        logger.info("📁 BSA folder: %s", self.bsa_folder)
+        logger.info("📝 Log level: %s", self.log_level)
         logger.info("💡 Ready to process PDF files!")
         
         return True
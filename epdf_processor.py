@@ -1,22 +1,199 @@
-import boto3
-import json
+import hashlib
 import logging
+import multiprocessing
 import tempfile
+import threading
+import time
 import os
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple
 from botocore.exceptions import ClientError, NoCredentialsError
-import PyPDF2
-import pdfplumber
-import fitz  # PyMuPDF
-from io import BytesIO
-import pandas as pd
-from bank_formatters import BankFormatterFactory, auto_detect_bank
-from pdf_password_utils import PDFPasswordHandler
+import orjson
+from bank_formatters_main import BankFormatterFactory, auto_detect_bank
+
+# The PDF libraries and boto3 are imported where they are used, so importing
+# this module (e.g. for auto_detect_bank) stays cheap
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Text-layer pre-flight: pages extracted first from the start of the document;
+# if none of them has any text the PDF is treated as scanned and the rest of
+# the document is skipped
+TEXT_LAYER_SAMPLE_PAGES = 5
+
+# Columns of extracted_data["images_info"], which holds one list per field
+# (all of the same length) rather than one record per image
+IMAGE_INFO_FIELDS = (
+    "page", "image_index", "xref", "smask", "width", "height",
+    "bpc", "colorspace", "alt", "name", "filter"
+)
+
+# Version of the layout of process_epdf results, reported as schema_version.
+# Version 1 (EPdfProcessor(legacy_output=True)) lists images_info as one dict
+# per image; version 2 holds it as columns keyed by IMAGE_INFO_FIELDS
+OUTPUT_SCHEMA_VERSION = 2
+LEGACY_OUTPUT_SCHEMA_VERSION = 1
+
+# S3 downloads above this size are fetched as parallel ranged GETs
+S3_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+S3_MAX_CONCURRENCY = 8
+
+# HTTP connections kept by the S3 client, shared by batch downloads
+S3_MAX_POOL_CONNECTIONS = 64
+S3_BATCH_MAX_WORKERS = 32
+
+
+class PDFPasswordError(ValueError):
+    """
+    Raised when a password-protected ePDF can't be unlocked with the given
+    password (or none was given)
+    """
+
+
+# Cached extraction results older than this are re-extracted
+EXTRACTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Documents with at least this many pages are extracted in a process pool of
+# up to PARALLEL_MAX_WORKERS workers, each handling one contiguous page range
+PARALLEL_MIN_PAGES = 16
+PARALLEL_MAX_WORKERS = 6
+
+# Page pool workers are started from a fork server (or spawned where that is
+# unavailable) rather than forked, since the pool may be created while S3
+# download threads hold locks (boto3, logging) that a forked child would inherit.
+# As with any spawned pool, scripts that extract large documents need an
+# `if __name__ == "__main__":` guard
+PARALLEL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _iter_pages(pdf_document: "fitz.Document", start: int, stop: int,
+                extract_images: bool = True) -> Iterator[Tuple[str, list, list]]:
+    """
+    Extract text, tables and images info from a range of pages, one page at a time
+    
+    Args:
+        pdf_document: Open PyMuPDF document
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        extract_images: Whether to list each page's images (left empty otherwise)
+        
+    Yields:
+        Tuple[str, list, list]: (text, tables, images_info) for each page, in page order
+    """
+    import fitz  # PyMuPDF
+    
+    # Plain-text extraction flags (whitespace kept, text clipped to the
+    # page), with ligatures expanded into their letters so the bank parsers
+    # match them like ordinary text
+    text_flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+    
+    # Iterate the document's page generator rather than indexing it, and
+    # number pages from 1 as they appear in the output
+    for page_number, page in enumerate(pdf_document.pages(start, stop), start + 1):
+        # Build the textpage once and keep the content-stream order; the
+        # bank parsers work line by line and don't need coordinate sorting
+        text = page.get_textpage(flags=text_flags).extractText(sort=False)
+        
+        # Extract tables
+        tables = [
+            {"page": page_number, "table_index": table_index, "data": table.extract()}
+            for table_index, table in enumerate(page.find_tables())
+        ]
+        
+        # Extract images info as flat tuples (see IMAGE_INFO_FIELDS)
+        images_info = [
+            (page_number, img_index, *img[:9])
+            for img_index, img in enumerate(page.get_images())
+        ] if extract_images else []
+        
+        yield text, tables, images_info
+
+
+def _extract_pages(pdf_document: "fitz.Document", start: int, stop: int,
+                   extract_images: bool = True) -> List[Tuple[str, list, list]]:
+    """
+    Extract text, tables and images info from a range of pages
+    
+    Args:
+        pdf_document: Open PyMuPDF document
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        extract_images: Whether to list each page's images (left empty otherwise)
+        
+    Returns:
+        List[Tuple[str, list, list]]: (text, tables, images_info) per page, in page order
+    """
+    return list(_iter_pages(pdf_document, start, stop, extract_images))
+
+
+def _extract_page_range(shm_name: str, size: int, start: int, stop: int,
+                        extract_images: bool = True) -> List[Tuple[str, list, list]]:
+    """
+    Process pool entry point: open the PDF from shared memory and extract a range of pages
+    
+    Args:
+        shm_name: Name of the shared memory block holding the unlocked PDF
+        size: Size of the PDF in bytes
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        extract_images: Whether to list each page's images (left empty otherwise)
+        
+    Returns:
+        List[Tuple[str, list, list]]: (text, tables, images_info) per page, in page order
+    """
+    import fitz  # PyMuPDF
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pdf_content = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    
+    pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
+    try:
+        return _extract_pages(pdf_document, start, stop, extract_images)
+    finally:
+        pdf_document.close()
+
+
+def _join_page_texts(page_texts: List[str]) -> Tuple[str, List[int]]:
+    """
+    Join page texts into the text_content string with page separators
+    
+    Args:
+        page_texts: Text of each page, in page order
+        
+    Returns:
+        Tuple[str, List[int]]: (text_content, offset in text_content where
+        each page's text starts)
+    """
+    text_parts = []
+    page_offsets = []
+    offset = 0
+    for page_num, text in enumerate(page_texts):
+        separator = f"\n--- Page {page_num + 1} ---\n"
+        text_parts.append(separator)
+        text_parts.append(text)
+        offset += len(separator)
+        page_offsets.append(offset)
+        offset += len(text)
+    
+    full_text = "".join(text_parts)
+    
+    # Keep offsets aligned with the stripped text
+    leading = len(full_text) - len(full_text.lstrip())
+    full_text = full_text.strip()
+    page_offsets = [min(max(page_offset - leading, 0), len(full_text)) for page_offset in page_offsets]
+    return full_text, page_offsets
+
 
 class EPdfProcessor:
     """
@@ -24,7 +201,10 @@ class EPdfProcessor:
     """
     
     def __init__(self, aws_access_key_id: str = None, aws_secret_access_key: str = None, 
-                 region_name: str = 'us-east-1'):
+                 region_name: str = 'us-east-1', cache_dir: Optional[str] = None,
+                 cache_ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS, extract_images: bool = True,
+                 max_page_workers: int = PARALLEL_MAX_WORKERS, legacy_output: bool = False,
+                 s3_body_cache_bytes: int = 0):
         """
         Initialize the ePDF processor with AWS credentials
         
@@ -32,22 +212,127 @@ class EPdfProcessor:
             aws_access_key_id: AWS access key ID
             aws_secret_access_key: AWS secret access key
             region_name: AWS region name
+            cache_dir: Optional directory for caching extraction results by PDF content
+            cache_ttl_seconds: Age after which cached extraction results expire
+            extract_images: Whether to record per-page image info in extraction
+                            results; text and tables are extracted either way
+            max_page_workers: Maximum page pool size for large documents; 1
+                              extracts every page in this process (e.g. when
+                              the caller already runs in a process pool)
+            legacy_output: Return results in the schema version 1 layout, with
+                           images_info as one dict per image
+            s3_body_cache_bytes: Total size of downloaded ePDFs kept in memory,
+                                 so reprocessing an unchanged session only
+                                 costs a conditional GET; 0 (the default)
+                                 disables the cache
         """
+        import boto3
+        from botocore.config import Config as BotoConfig
+        
+        self.cache_dir = cache_dir
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.extract_images = extract_images
+        self.max_page_workers = max_page_workers
+        self.legacy_output = legacy_output
+        self.s3_body_cache_bytes = s3_body_cache_bytes
+        # (bucket, session_id) -> (ETag, body) of downloaded ePDFs, least
+        # recently used first
+        self._s3_body_cache: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._s3_body_cache_size = 0
+        self._s3_body_cache_lock = threading.Lock()
+        
         try:
             self.s3_client = boto3.client(
                 's3',
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
-                region_name=region_name
+                region_name=region_name,
+                config=BotoConfig(
+                    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                    retries={'mode': 'adaptive'}
+                )
             )
             logger.info("S3 client initialized successfully")
         except NoCredentialsError:
             logger.error("AWS credentials not found")
             raise
         except Exception as e:
-            logger.error(f"Failed to initialize S3 client: {str(e)}")
+            logger.error("Failed to initialize S3 client: %s", e)
             raise
     
+    def _get_object_key(self, session_id: str) -> str:
+        """
+        Build the S3 object key for a session's ePDF
+        
+        Args:
+            session_id: Session ID used as file reference/key
+            
+        Returns:
+            str: S3 object key
+        """
+        # You may need to adjust this based on your S3 structure
+        return f"epdfs/{session_id}.pdf"  # Adjust path as needed
+    
+    def _get_transfer_config(self):
+        """
+        Build the transfer settings used for ePDF downloads
+        
+        Returns:
+            TransferConfig: Lets the transfer manager split large objects into
+            parallel ranged GETs instead of streaming over a single connection
+        """
+        from boto3.s3.transfer import TransferConfig
+        
+        return TransferConfig(
+            multipart_threshold=S3_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+            max_concurrency=S3_MAX_CONCURRENCY
+        )
+    
+    def _raise_for_s3_error(self, error: ClientError, bucket_name: str, session_id: str) -> None:
+        """
+        Log an S3 download error and re-raise it, mapping missing objects and
+        buckets to FileNotFoundError
+        
+        Args:
+            error: ClientError raised by the download
+            bucket_name: Name of the S3 bucket
+            session_id: Session ID used as file reference/key
+        """
+        error_code = error.response['Error']['Code']
+        # The HEAD request download_fileobj starts with reports a missing key
+        # as a bare 404
+        if error_code in ('NoSuchKey', '404'):
+            logger.error("ePDF not found for session_id: %s", session_id)
+            raise FileNotFoundError(f"ePDF not found for session_id: {session_id}")
+        elif error_code == 'NoSuchBucket':
+            logger.error("S3 bucket not found: %s", bucket_name)
+            raise FileNotFoundError(f"S3 bucket not found: {bucket_name}")
+        else:
+            logger.error("AWS S3 error: %s", error)
+            raise error
+    
+    def _cache_s3_body(self, cache_key: Tuple[str, str], etag: str, pdf_content: bytes) -> None:
+        """
+        Store a downloaded ePDF body in the S3 body cache, evicting old entries
+        
+        Args:
+            cache_key: (bucket, session_id) of the ePDF
+            etag: ETag of the downloaded object
+            pdf_content: PDF content as bytes
+        """
+        if len(pdf_content) > self.s3_body_cache_bytes:
+            return
+        with self._s3_body_cache_lock:
+            previous = self._s3_body_cache.pop(cache_key, None)
+            if previous is not None:
+                self._s3_body_cache_size -= len(previous[1])
+            self._s3_body_cache[cache_key] = (etag, pdf_content)
+            self._s3_body_cache_size += len(pdf_content)
+            while self._s3_body_cache_size > self.s3_body_cache_bytes:
+                _, (_, evicted) = self._s3_body_cache.popitem(last=False)
+                self._s3_body_cache_size -= len(evicted)
+    
     def get_epdf_from_s3(self, bucket_name: str, session_id: str) -> bytes:
         """
         Retrieve ePDF from S3 bucket using session ID as reference
@@ -60,33 +345,148 @@ class EPdfProcessor:
             bytes: PDF content as bytes
         """
         try:
-            # Construct the object key using session_id
-            # You may need to adjust this based on your S3 structure
-            object_key = f"epdfs/{session_id}.pdf"  # Adjust path as needed
+            object_key = self._get_object_key(session_id)
             
-            logger.info(f"Attempting to retrieve ePDF for session_id: {session_id}")
+            logger.info("Attempting to retrieve ePDF for session_id: %s", session_id)
             
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
-            pdf_content = response['Body'].read()
+            cache_key = (bucket_name, session_id)
+            with self._s3_body_cache_lock:
+                cached = self._s3_body_cache.get(cache_key)
             
-            logger.info(f"Successfully retrieved ePDF for session_id: {session_id}")
+            # The first part comes from a ranged GET, which also reports the
+            # object's ETag and total size; with a cached body it is made
+            # conditional, so an unchanged object is answered with 304
+            request = {
+                'Bucket': bucket_name,
+                'Key': object_key,
+                'Range': f"bytes=0-{S3_MULTIPART_CHUNK_SIZE - 1}"
+            }
+            if cached is not None:
+                request['IfNoneMatch'] = cached[0]
+            try:
+                response = self.s3_client.get_object(**request)
+            except ClientError as e:
+                if cached is None or e.response['Error']['Code'] not in ('304', 'NotModified'):
+                    raise
+                with self._s3_body_cache_lock:
+                    if cache_key in self._s3_body_cache:
+                        self._s3_body_cache.move_to_end(cache_key)
+                logger.info("Using cached ePDF for session_id: %s", session_id)
+                return cached[1]
+            
+            etag = response['ETag']
+            first_part = response['Body'].read()
+            total_size = int(response['ContentRange'].rsplit('/', 1)[1])
+            if total_size > len(first_part):
+                pdf_content = self._download_remaining_parts(bucket_name, object_key, etag, first_part, total_size)
+            else:
+                pdf_content = first_part
+            
+            if self.s3_body_cache_bytes:
+                self._cache_s3_body(cache_key, etag, pdf_content)
+            
+            logger.info("Successfully retrieved ePDF for session_id: %s", session_id)
             return pdf_content
             
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code == 'NoSuchKey':
-                logger.error(f"ePDF not found for session_id: {session_id}")
-                raise FileNotFoundError(f"ePDF not found for session_id: {session_id}")
-            elif error_code == 'NoSuchBucket':
-                logger.error(f"S3 bucket not found: {bucket_name}")
-                raise FileNotFoundError(f"S3 bucket not found: {bucket_name}")
-            else:
-                logger.error(f"AWS S3 error: {str(e)}")
-                raise
+            self._raise_for_s3_error(e, bucket_name, session_id)
+        except Exception as e:
+            logger.error("Unexpected error retrieving ePDF: %s", e)
+            raise
+    
+    def _download_remaining_parts(self, bucket_name: str, object_key: str, etag: str,
+                                  first_part: bytes, total_size: int) -> bytes:
+        """
+        Fetch the rest of an S3 object as parallel ranged GETs
+        
+        Every part is requested with IfMatch on the first part's ETag, so a
+        body is never stitched together from two versions of the object.
+        
+        Args:
+            bucket_name: Name of the S3 bucket
+            object_key: S3 object key
+            etag: ETag reported with the first part
+            first_part: Bytes already downloaded from the start of the object
+            total_size: Size of the whole object in bytes
+            
+        Returns:
+            bytes: Content of the whole object
+        """
+        buffer = bytearray(total_size)
+        buffer[:len(first_part)] = first_part
+        
+        def download_part(offset: int) -> None:
+            end = min(offset + S3_MULTIPART_CHUNK_SIZE, total_size)
+            response = self.s3_client.get_object(
+                Bucket=bucket_name, Key=object_key, Range=f"bytes={offset}-{end - 1}", IfMatch=etag
+            )
+            buffer[offset:end] = response['Body'].read()
+        
+        offsets = range(len(first_part), total_size, S3_MULTIPART_CHUNK_SIZE)
+        with ThreadPoolExecutor(max_workers=min(S3_MAX_CONCURRENCY, len(offsets))) as executor:
+            # list() surfaces the first failed part
+            list(executor.map(download_part, offsets))
+        return bytes(buffer)
+    
+    def download_epdf_to_file(self, bucket_name: str, session_id: str, dest_dir: Optional[str] = None) -> str:
+        """
+        Stream an ePDF from S3 straight to a temporary file
+        
+        Chunks are written to disk as they arrive, so very large statements
+        never have to be held in memory; the returned path can be passed to
+        fitz.open() or LocalEPdfProcessor. The caller owns the file and should
+        delete it when done.
+        
+        Args:
+            bucket_name: Name of the S3 bucket
+            session_id: Session ID used as file reference/key
+            dest_dir: Optional directory for the temporary file
+            
+        Returns:
+            str: Path of the downloaded PDF
+        """
+        fd, pdf_path = tempfile.mkstemp(suffix=".pdf", prefix=f"{session_id}-", dir=dest_dir)
+        try:
+            object_key = self._get_object_key(session_id)
+            
+            logger.info("Attempting to download ePDF for session_id: %s to %s", session_id, pdf_path)
+            
+            with os.fdopen(fd, "wb") as pdf_file:
+                self.s3_client.download_fileobj(
+                    bucket_name, object_key, pdf_file, Config=self._get_transfer_config()
+                )
+            
+            logger.info("Successfully downloaded ePDF for session_id: %s", session_id)
+            return pdf_path
+            
+        except ClientError as e:
+            os.unlink(pdf_path)
+            self._raise_for_s3_error(e, bucket_name, session_id)
         except Exception as e:
-            logger.error(f"Unexpected error retrieving ePDF: {str(e)}")
+            os.unlink(pdf_path)
+            logger.error("Unexpected error downloading ePDF: %s", e)
             raise
     
+    def get_epdf_batch(self, bucket_name: str, session_ids: List[str]) -> List[bytes]:
+        """
+        Retrieve several ePDFs from S3 concurrently
+        
+        Downloads run in a thread pool and share the client's connection pool.
+        
+        Args:
+            bucket_name: Name of the S3 bucket
+            session_ids: Session IDs used as file references/keys
+            
+        Returns:
+            List[bytes]: PDF content for each session ID, in the same order
+        """
+        if not session_ids:
+            return []
+        
+        max_workers = min(S3_BATCH_MAX_WORKERS, len(session_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_epdf_from_s3, repeat(bucket_name), session_ids))
+    
     def extract_data_from_epdf(self, pdf_content: bytes, password: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract data from ePDF content and return as JSON
@@ -98,111 +498,279 @@ class EPdfProcessor:
         Returns:
             Dict[str, Any]: Extracted data as dictionary
         """
+        import fitz  # PyMuPDF
+        import pypdfium2 as pdfium
+        from pdf_password_utils import PDFPasswordHandler
+        
         extracted_data = {
             "metadata": {},
             "text_content": "",
+            "page_offsets": [],
             "tables": [],
-            "images_info": [],
+            "images_info": {field: [] for field in IMAGE_INFO_FIELDS},
             "pages_count": 0,
             "extraction_method": "multiple"
         }
         
         try:
-            # Check if PDF is password protected and unlock if needed
-            logger.info(f"Validating password protection (password provided: {password is not None})")
-            is_valid, error_msg, unlocked_content = PDFPasswordHandler.validate_password_protection(
-                pdf_content, password
-            )
-            
-            if not is_valid:
-                logger.error(f"Password protection error: {error_msg}")
-                # Provide more specific error messages
-                if "Password Protected File" in error_msg:
-                    raise ValueError("Password Protected File - Please provide a password to unlock this PDF")
-                elif "Invalid password" in error_msg:
-                    raise ValueError("Invalid password provided - Please check the password and try again")
-                else:
-                    raise ValueError(f"PDF processing error: {error_msg}")
-            
-            # Use unlocked content for processing
-            pdf_content = unlocked_content
-            logger.info(f"PDF successfully validated/unlocked, proceeding with extraction")
-            # Method 1: Using PyMuPDF (fitz) for comprehensive extraction
+            # Method 1: Using PyMuPDF (fitz) for comprehensive extraction.
+            # Most statements are not encrypted, so the document opened here
+            # is used directly and the password handler (which parses the
+            # PDF again) only runs when it is actually needed
             pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
-            extracted_data["pages_count"] = len(pdf_document)
-            
-            # Extract metadata
-            metadata = pdf_document.metadata
-            extracted_data["metadata"] = {
-                "title": metadata.get("title", ""),
-                "author": metadata.get("author", ""),
-                "subject": metadata.get("subject", ""),
-                "creator": metadata.get("creator", ""),
-                "producer": metadata.get("producer", ""),
-                "creation_date": metadata.get("creationDate", ""),
-                "modification_date": metadata.get("modDate", "")
-            }
+            if pdf_document.needs_pass:
+                pdf_document.close()
+                
+                # Unlock the PDF with the provided password
+                logger.info("Validating password protection (password provided: %s)", password is not None)
+                is_valid, error_msg, unlocked_content = PDFPasswordHandler.validate_password_protection(
+                    pdf_content, password
+                )
+                
+                if not is_valid:
+                    logger.error("Password protection error: %s", error_msg)
+                    # Provide more specific error messages
+                    if "Password Protected File" in error_msg:
+                        raise PDFPasswordError("Password Protected File - Please provide a password to unlock this PDF")
+                    elif "Invalid password" in error_msg:
+                        raise PDFPasswordError("Invalid password provided - Please check the password and try again")
+                    else:
+                        raise PDFPasswordError(f"PDF processing error: {error_msg}")
+                
+                # Use unlocked content for processing
+                pdf_content = unlocked_content
+                logger.info("PDF successfully unlocked, proceeding with extraction")
+                pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
             
-            # Extract text content
-            full_text = ""
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                text = page.get_text()
-                full_text += f"\n--- Page {page_num + 1} ---\n{text}"
+            with pdf_document:
+                extracted_data["pages_count"] = len(pdf_document)
                 
-                # Extract images info
-                image_list = page.get_images()
-                for img_index, img in enumerate(image_list):
-                    extracted_data["images_info"].append({
-                        "page": page_num + 1,
-                        "image_index": img_index,
-                        "xref": img[0],
-                        "smask": img[1],
-                        "width": img[2],
-                        "height": img[3],
-                        "bpc": img[4],
-                        "colorspace": img[5],
-                        "alt": img[6],
-                        "name": img[7],
-                        "filter": img[8]
-                    })
-            
-            extracted_data["text_content"] = full_text.strip()
-            pdf_document.close()
-            
-            # Method 2: Using pdfplumber for table extraction
-            with pdfplumber.open(BytesIO(pdf_content)) as pdf:
-                tables = []
-                for page_num, page in enumerate(pdf.pages):
-                    page_tables = page.extract_tables()
-                    for table_index, table in enumerate(page_tables):
-                        tables.append({
-                            "page": page_num + 1,
-                            "table_index": table_index,
-                            "data": table
-                        })
-                extracted_data["tables"] = tables
-            
-            logger.info(f"Successfully extracted data from ePDF with {extracted_data['pages_count']} pages")
+                # Extract metadata
+                metadata = pdf_document.metadata
+                extracted_data["metadata"] = {
+                    "title": metadata.get("title", ""),
+                    "author": metadata.get("author", ""),
+                    "subject": metadata.get("subject", ""),
+                    "creator": metadata.get("creator", ""),
+                    "producer": metadata.get("producer", ""),
+                    "creation_date": metadata.get("creationDate", ""),
+                    "modification_date": metadata.get("modDate", "")
+                }
+                
+                # Extract text content, tables and images from the same parsed
+                # document, starting with the first pages so scanned/image-only
+                # PDFs are skipped before the rest of the per-page work. Short
+                # pages (e.g. a closing "Page 2 of 2") still count as text.
+                pages_count = extracted_data["pages_count"]
+                use_page_pool = pages_count >= PARALLEL_MIN_PAGES and self.max_page_workers > 1
+                sampled = min(TEXT_LAYER_SAMPLE_PAGES, pages_count)
+                page_results = _extract_pages(pdf_document, 0, sampled, self.extract_images)
+                if sampled and not any(text.strip() for text, _, _ in page_results):
+                    logger.warning("PDF appears to be scanned (no text layer on the first %d pages), skipping extraction", sampled)
+                    extracted_data["extraction_method"] = "skipped_scanned"
+                    return extracted_data
+                
+                if sampled < pages_count and not use_page_pool:
+                    page_results.extend(_extract_pages(pdf_document, sampled, pages_count, self.extract_images))
             
-        except Exception as e:
-            logger.error(f"Error extracting data from ePDF: {str(e)}")
-            # Fallback to basic PyPDF2 extraction
+            # Pages are independent, so the rest of a large document is split
+            # into page ranges and extracted in parallel once this process has
+            # released its own copy of the document
+            if use_page_pool:
+                try:
+                    page_results.extend(self._extract_pages_parallel(pdf_content, sampled, pages_count))
+                except OSError as e:
+                    # No usable shared memory or worker processes (e.g. on
+                    # Lambda, which has no /dev/shm), so extract here instead
+                    logger.warning("Page pool unavailable, extracting pages serially: %s", e)
+                    with fitz.open(stream=pdf_content, filetype="pdf") as pdf_document:
+                        page_results.extend(_extract_pages(pdf_document, sampled, pages_count, self.extract_images))
+            
+            page_texts = []
+            tables = []
+            images = []
+            for text, page_tables, page_images in page_results:
+                page_texts.append(text)
+                tables.extend(page_tables)
+                images.extend(page_images)
+            
+            extracted_data["text_content"], extracted_data["page_offsets"] = _join_page_texts(page_texts)
+            extracted_data["tables"] = tables
+            # Transpose the per-image tuples into one column per field
+            for field, column in zip(IMAGE_INFO_FIELDS, zip(*images)):
+                extracted_data["images_info"][field] = list(column)
+            
+            logger.info("Successfully extracted data from ePDF with %d pages", extracted_data["pages_count"])
+            
+        except PDFPasswordError:
+            raise
+        except (RuntimeError, ValueError, IndexError) as e:
+            # MuPDF reports unreadable or damaged documents as RuntimeError
+            # subclasses (e.g. fitz.FileDataError), as does a broken page
+            # worker pool; find_tables raises ValueError or IndexError on
+            # malformed pages
+            logger.error("Error extracting data from ePDF: %s", e)
+            # Fallback to basic PDFium text extraction
             try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
-                extracted_data["pages_count"] = len(pdf_reader.pages)
-                extracted_data["extraction_method"] = "fallback_pypdf2"
+                pdf = pdfium.PdfDocument(pdf_content)
+                try:
+                    extracted_data["pages_count"] = len(pdf)
+                    extracted_data["extraction_method"] = "fallback_pdfium"
+                    
+                    page_texts = []
+                    for page_num in range(len(pdf)):
+                        page = pdf[page_num]
+                        textpage = page.get_textpage()
+                        try:
+                            # PDFium separates lines with \r\n
+                            page_texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                        finally:
+                            textpage.close()
+                            page.close()
+                finally:
+                    pdf.close()
                 
-                text_content = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text_content += f"\n--- Page {page_num + 1} ---\n{page.extract_text()}"
-                
-                extracted_data["text_content"] = text_content.strip()
-                logger.info("Used fallback PyPDF2 extraction method")
+                extracted_data["text_content"], extracted_data["page_offsets"] = _join_page_texts(page_texts)
+                logger.info("Used fallback PDFium extraction method")
                 
             except Exception as fallback_error:
-                logger.error(f"Fallback extraction also failed: {str(fallback_error)}")
+                logger.error("Fallback extraction also failed: %s", fallback_error)
+                raise
+        
+        return extracted_data
+    
+    def iter_pages(self, pdf_content: bytes, password: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract an ePDF page by page, for callers that store or stream results
+        per page instead of holding a whole document's results in memory
+        
+        Unlike extract_data_from_epdf, there is no scanned-PDF check, process
+        pool or fallback extraction; pages are extracted in this process as
+        they are consumed.
+        
+        Args:
+            pdf_content: PDF content as bytes
+            password: Optional password for password-protected PDFs
+            
+        Yields:
+            Dict[str, Any]: page_num, text, tables and images (one dict per
+            image, keyed by IMAGE_INFO_FIELDS) for each page, in page order
+        """
+        import fitz  # PyMuPDF
+        
+        with fitz.open(stream=pdf_content, filetype="pdf") as pdf_document:
+            if pdf_document.needs_pass:
+                if not password:
+                    raise PDFPasswordError("Password Protected File - Please provide a password to unlock this PDF")
+                if not pdf_document.authenticate(password):
+                    raise PDFPasswordError("Invalid password provided - Please check the password and try again")
+            
+            page_results = _iter_pages(pdf_document, 0, len(pdf_document), self.extract_images)
+            for page_num, (text, tables, images_info) in enumerate(page_results, 1):
+                yield {
+                    "page_num": page_num,
+                    "text": text,
+                    "tables": tables,
+                    "images": [dict(zip(IMAGE_INFO_FIELDS, image_info)) for image_info in images_info]
+                }
+    
+    def _extract_pages_parallel(self, pdf_content: bytes, start: int, stop: int) -> List[Tuple[str, list, list]]:
+        """
+        Extract a range of pages in a process pool, one contiguous sub-range per worker
+        
+        The PDF is placed in shared memory once instead of being pickled to
+        every worker.
+        
+        Args:
+            pdf_content: Unlocked PDF content as bytes
+            start: First page index (inclusive)
+            stop: Last page index (exclusive)
+            
+        Returns:
+            List[Tuple[str, list, list]]: (text, tables, images_info) per page, in page order
+        """
+        pages_count = stop - start
+        workers = min(os.cpu_count() or 1, self.max_page_workers, pages_count)
+        bounds = [start + pages_count * worker // workers for worker in range(workers + 1)]
+        
+        shm = shared_memory.SharedMemory(create=True, size=len(pdf_content))
+        try:
+            shm.buf[:len(pdf_content)] = pdf_content
+            mp_context = multiprocessing.get_context(PARALLEL_START_METHOD)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                chunks = executor.map(
+                    _extract_page_range,
+                    repeat(shm.name), repeat(len(pdf_content)), bounds[:-1], bounds[1:],
+                    repeat(self.extract_images)
+                )
+                return [result for chunk in chunks for result in chunk]
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def _get_cache_path(self, pdf_content: bytes, password: Optional[str] = None) -> str:
+        """
+        Get the cache file path for a PDF's extraction result
+        
+        Args:
+            pdf_content: PDF content as bytes
+            password: Optional password, included so a cached result is never
+                      served for a protected PDF without its password
+            
+        Returns:
+            str: Path of the cache file
+        """
+        hasher = hashlib.blake2b(pdf_content, digest_size=16)
+        # Results extracted without image info are kept apart from full ones
+        if not self.extract_images:
+            hasher.update(b"\1")
+        if password is not None:
+            hasher.update(b"\0" + password.encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{hasher.hexdigest()}.json")
+    
+    def extract_data_with_cache(self, pdf_content: bytes, password: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract data from ePDF content, reusing a cached result for identical content
+        
+        Args:
+            pdf_content: PDF content as bytes
+            password: Optional password for password-protected PDFs
+            
+        Returns:
+            Dict[str, Any]: Extracted data as dictionary
+        """
+        if not self.cache_dir:
+            return self.extract_data_from_epdf(pdf_content, password)
+        
+        cache_path = self._get_cache_path(pdf_content, password)
+        try:
+            with open(cache_path, 'rb') as f:
+                cache_age = time.time() - os.fstat(f.fileno()).st_mtime
+                if cache_age <= self.cache_ttl_seconds:
+                    extracted_data = orjson.loads(f.read())
+                    logger.info("Using cached extraction result: %s", cache_path)
+                    return extracted_data
+            logger.info("Cached extraction result expired: %s", cache_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Ignoring unreadable extraction cache %s: %s", cache_path, e)
+        
+        extracted_data = self.extract_data_from_epdf(pdf_content, password)
+        
+        # Write to a temporary file first so a crash never leaves a partial cache entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(orjson.dumps(extracted_data, default=str))
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                os.unlink(tmp_path)
                 raise
+        except Exception as e:
+            logger.warning("Failed to write extraction cache %s: %s", cache_path, e)
         
         return extracted_data
     
@@ -215,7 +783,7 @@ class EPdfProcessor:
             bank_name: Name of the bank (optional, will auto-detect if not provided)
             
         Returns:
-            Dict[str, Any]: Data with bank-specific formatting applied
+            Dict[str, Any]: extracted_data, updated in place with bank-specific formatting
         """
         try:
             text_content = extracted_data.get("text_content", "")
@@ -225,37 +793,37 @@ class EPdfProcessor:
                 detected_bank = auto_detect_bank(text_content)
                 if detected_bank:
                     bank_name = detected_bank
-                    logger.info(f"Auto-detected bank: {bank_name}")
+                    logger.info("Auto-detected bank: %s", bank_name)
                 else:
                     logger.warning("Could not auto-detect bank, using generic formatting")
                     return extracted_data
             
             # Get bank-specific formatter
             try:
-                formatter = BankFormatterFactory.get_formatter(bank_name)
-                logger.info(f"Using {bank_name} formatter")
+                format_transactions = BankFormatterFactory.get_format_function(bank_name)
+                logger.info("Using %s formatter", bank_name)
             except ValueError as e:
-                logger.error(f"Bank formatter error: {str(e)}")
+                logger.error("Bank formatter error: %s", e)
                 logger.info("Falling back to generic formatting")
                 return extracted_data
             
             # Apply bank-specific formatting
-            formatted_result = formatter.format_transactions(text_content)
+            formatted_result = format_transactions(text_content)
             
-            # Merge formatted data with original extracted data
-            result = extracted_data.copy()
-            result["bank_specific_data"] = formatted_result
-            result["bank_name"] = bank_name
+            # Add formatted data to the extracted data in place; callers
+            # don't reuse the unformatted dict
+            extracted_data["bank_specific_data"] = formatted_result
+            extracted_data["bank_name"] = bank_name
             
             # Add formatted transactions to main result if successful
             if formatted_result.get("success", False):
-                result["formatted_transactions"] = formatted_result.get("transactions", [])
-                result["total_formatted_transactions"] = formatted_result.get("total_transactions", 0)
+                extracted_data["formatted_transactions"] = formatted_result.get("transactions", [])
+                extracted_data["total_formatted_transactions"] = formatted_result.get("total_transactions", 0)
             
-            return result
+            return extracted_data
             
         except Exception as e:
-            logger.error(f"Error in bank-specific formatting: {str(e)}")
+            logger.error("Error in bank-specific formatting: %s", e)
             # Return original data if formatting fails
             return extracted_data
     
@@ -273,28 +841,100 @@ class EPdfProcessor:
             Dict[str, Any]: Extracted data as JSON-serializable dictionary with bank-specific formatting
         """
         try:
-            logger.info(f"Starting ePDF processing for session_id: {session_id}, bank: {bank_name or 'auto-detect'}")
+            logger.info("Starting ePDF processing for session_id: %s, bank: %s", session_id, bank_name or "auto-detect")
             
             # Step 1: Retrieve ePDF from S3
             pdf_content = self.get_epdf_from_s3(bucket_name, session_id)
             
-            # Step 2: Extract data from ePDF
-            extracted_data = self.extract_data_from_epdf(pdf_content, password)
-            
-            # Step 3: Apply bank-specific formatting
-            formatted_data = self.format_with_bank_specific_parser(extracted_data, bank_name)
-            
-            # Add session information
-            formatted_data["session_id"] = session_id
-            formatted_data["bucket_name"] = bucket_name
-            formatted_data["processing_timestamp"] = str(pd.Timestamp.now())
+            # Steps 2 and 3: Extract data and apply bank-specific formatting
+            formatted_data = self._process_epdf_content(bucket_name, session_id, pdf_content, bank_name, password)
             
-            logger.info(f"Successfully processed ePDF for session_id: {session_id}")
+            logger.info("Successfully processed ePDF for session_id: %s", session_id)
             return formatted_data
             
         except Exception as e:
-            logger.error(f"Failed to process ePDF for session_id {session_id}: {str(e)}")
+            logger.error("Failed to process ePDF for session_id %s: %s", session_id, e)
             raise
+    
+    def process_epdf_batch(self, bucket_name: str, session_ids: List[str], bank_name: str = None,
+                           password: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Process several sessions, overlapping S3 downloads with extraction
+        
+        Downloads run in a thread pool; each ePDF is extracted and formatted
+        as soon as its download completes while the remaining downloads
+        carry on in the background.
+        
+        Args:
+            bucket_name: Name of the S3 bucket
+            session_ids: Session IDs used as file references
+            bank_name: Name of the bank (optional, will auto-detect if not provided)
+            password: Optional password for password-protected PDFs
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Processed data per session ID, in input order;
+            failed sessions map to a dictionary with an "error" message
+        """
+        results = {}
+        if not session_ids:
+            return results
+        
+        max_workers = min(S3_BATCH_MAX_WORKERS, len(session_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_epdf_from_s3, bucket_name, session_id): session_id
+                for session_id in session_ids
+            }
+            for future in as_completed(futures):
+                session_id = futures[future]
+                try:
+                    results[session_id] = self._process_epdf_content(
+                        bucket_name, session_id, future.result(), bank_name, password
+                    )
+                    logger.info("Successfully processed ePDF for session_id: %s", session_id)
+                except Exception as e:
+                    logger.error("Failed to process ePDF for session_id %s: %s", session_id, e)
+                    results[session_id] = {
+                        "session_id": session_id,
+                        "bucket_name": bucket_name,
+                        "error": str(e)
+                    }
+        
+        return {session_id: results[session_id] for session_id in session_ids}
+    
+    def _process_epdf_content(self, bucket_name: str, session_id: str, pdf_content: bytes,
+                              bank_name: str = None, password: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract and format a downloaded ePDF and tag it with its session information
+        
+        Args:
+            bucket_name: Name of the S3 bucket the ePDF came from
+            session_id: Session ID used as file reference
+            pdf_content: PDF content as bytes
+            bank_name: Name of the bank (optional, will auto-detect if not provided)
+            password: Optional password for password-protected PDFs
+            
+        Returns:
+            Dict[str, Any]: Extracted data with bank-specific formatting and session information
+        """
+        extracted_data = self.extract_data_with_cache(pdf_content, password)
+        if self.legacy_output:
+            images_info = extracted_data["images_info"]
+            extracted_data["images_info"] = [
+                dict(zip(IMAGE_INFO_FIELDS, image_info))
+                for image_info in zip(*(images_info[field] for field in IMAGE_INFO_FIELDS))
+            ]
+        formatted_data = self.format_with_bank_specific_parser(extracted_data, bank_name)
+        
+        # Add session information
+        formatted_data["session_id"] = session_id
+        formatted_data["bucket_name"] = bucket_name
+        formatted_data["processing_timestamp"] = datetime.now(timezone.utc).isoformat()
+        formatted_data["schema_version"] = (
+            LEGACY_OUTPUT_SCHEMA_VERSION if self.legacy_output else OUTPUT_SCHEMA_VERSION
+        )
+        
+        return formatted_data
 
 
 def main():
@@ -349,8 +989,8 @@ def main():
         
         # Save to file if needed
         output_filename = f"extracted_data_{SESSION_ID}_{BANK_NAME or 'auto'}.json"
-        with open(output_filename, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        with open(output_filename, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"\nData saved to: {output_filename}")
         
@@ -358,7 +998,7 @@ def main():
         print(f"\nSupported Banks: {BankFormatterFactory.get_supported_banks()}")
         
     except Exception as e:
-        logger.error(f"Main execution failed: {str(e)}")
+        logger.error("Main execution failed: %s", e)
         print(f"Error: {str(e)}")
 
 
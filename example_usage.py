@@ -4,7 +4,9 @@ Example usage script for ePDF processing from S3
 """
 
 import os
-import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import orjson
 from epdf_processor import EPdfProcessor
 
 def example_usage():
@@ -44,7 +46,7 @@ def example_usage():
         print(f"Pages Count: {result['pages_count']}")
         print(f"Extraction Method: {result['extraction_method']}")
         print(f"Tables Found: {len(result['tables'])}")
-        print(f"Images Found: {len(result['images_info'])}")
+        print(f"Images Found: {len(result['images_info']['page'])}")
         print(f"Text Length: {len(result['text_content'])} characters")
         print(f"Formatted Transactions: {result.get('total_formatted_transactions', 0)}")
         
@@ -67,8 +69,8 @@ def example_usage():
         
         # Save detailed results to file
         output_filename = f"extracted_data_{SESSION_ID}_{BANK_NAME or 'auto'}.json"
-        with open(output_filename, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        with open(output_filename, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"\nDetailed results saved to: {output_filename}")
         
@@ -90,9 +92,64 @@ def example_usage():
         print(f"Error processing ePDF: {str(e)}")
         return None
 
+# Per-process EPdfProcessor used by process_multiple_sessions; boto3 clients
+# and PDF documents can't be shared across processes, so each worker builds
+# its own in _init_session_worker. Sessions already run one per CPU, so the
+# workers extract pages themselves instead of opening nested page pools
+# (which pool workers can't do on Python 3.8, and which would oversubscribe
+# the CPUs elsewhere)
+_worker_processor = None
+
+
+def _init_session_worker():
+    """
+    Process pool initializer: create this worker's EPdfProcessor
+    """
+    global _worker_processor
+    _worker_processor = EPdfProcessor(max_page_workers=1)
+
+
+def _process_session(bucket_name, config):
+    """
+    Process one session in a pool worker and summarize the result
+    
+    Only the summary is sent back to the parent process, not the full
+    extraction result.
+    
+    Args:
+        bucket_name: Name of the S3 bucket
+        config: Session configuration with "session_id" and "bank"
+        
+    Returns:
+        Summary of the processing result
+    """
+    session_id = config["session_id"]
+    bank_name = config["bank"]
+    
+    try:
+        result = _worker_processor.process_epdf(bucket_name, session_id, bank_name)
+        return {
+            "success": True,
+            "bank_name": result.get('bank_name', 'N/A'),
+            "pages_count": result['pages_count'],
+            "tables_count": len(result['tables']),
+            "text_length": len(result['text_content']),
+            "formatted_transactions": result.get('total_formatted_transactions', 0)
+        }
+    except Exception as e:
+        print(f"Failed to process {session_id}: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
 def process_multiple_sessions():
     """
     Example of processing multiple ePDFs with different banks
+    
+    Sessions are independent, so they are processed in parallel across a
+    process pool with one worker per CPU.
     """
     # Example configuration for multiple sessions with different banks
     sessions_config = [
@@ -104,30 +161,16 @@ def process_multiple_sessions():
     
     bucket_name = os.getenv('S3_BUCKET_NAME', 'your-s3-bucket-name')
     
-    processor = EPdfProcessor()
-    
-    results = {}
     for config in sessions_config:
-        session_id = config["session_id"]
-        bank_name = config["bank"]
-        
-        try:
-            print(f"Processing session: {session_id}, bank: {bank_name or 'auto-detect'}")
-            result = processor.process_epdf(bucket_name, session_id, bank_name)
-            results[session_id] = {
-                "success": True,
-                "bank_name": result.get('bank_name', 'N/A'),
-                "pages_count": result['pages_count'],
-                "tables_count": len(result['tables']),
-                "text_length": len(result['text_content']),
-                "formatted_transactions": result.get('total_formatted_transactions', 0)
-            }
-        except Exception as e:
-            print(f"Failed to process {session_id}: {str(e)}")
-            results[session_id] = {
-                "success": False,
-                "error": str(e)
-            }
+        print(f"Processing session: {config['session_id']}, bank: {config['bank'] or 'auto-detect'}")
+    
+    max_workers = min(len(sessions_config), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_session_worker) as executor:
+        summaries = executor.map(_process_session, repeat(bucket_name), sessions_config)
+        results = {
+            config["session_id"]: summary
+            for config, summary in zip(sessions_config, summaries)
+        }
     
     return results
 
@@ -136,7 +179,7 @@ def demonstrate_bank_formatters():
     """
     Demonstrate different bank formatters with sample text
     """
-    from bank_formatters import BankFormatterFactory
+    from bank_formatters_main import BankFormatterFactory
     
     print("BankParser Bank Formatters Demonstration")
     print("=" * 50)
@@ -204,4 +247,4 @@ if __name__ == "__main__":
     # print("Multiple Sessions Processing")
     # print("="*50)
     # multiple_results = process_multiple_sessions()
-    # print(json.dumps(multiple_results, indent=2))
+    # print(orjson.dumps(multiple_results, option=orjson.OPT_INDENT_2).decode())
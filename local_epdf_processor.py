@@ -7,7 +7,7 @@ A comprehensive ePDF processing system for bank statement extraction and analysi
 Handles local file-based processing with advanced features:
 
 - ePDF validation (text-based vs scanned PDFs)
-- Multi-library text extraction (PyMuPDF, pdfplumber, PyPDF2)
+- Multi-library text extraction (PyMuPDF, PDFium)
 - Comprehensive data extraction (text, tables, images, metadata)
 - Transaction formatting and structuring
 - Session-based organization
@@ -18,26 +18,37 @@ Author: {BRAND_AUTHOR}
 """
 
 import os
-import json
+import csv
+import gzip
+import hashlib
+import orjson
 import logging
+import mmap
+import re
 import glob
+import tempfile
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, BinaryIO, Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
-import fitz  # PyMuPDF
-import pdfplumber
-import PyPDF2
-from io import BytesIO
-import pandas as pd
-from datetime import datetime
-# Import directly from the main bank_formatters module to avoid circular imports
+from io import BytesIO, StringIO
+from datetime import datetime, timezone
+# The bank formatters are imported from the main bank_formatters module (to
+# avoid circular imports) inside format_with_bank_specific_parser
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))
-from bank_formatters_main import BankFormatterFactory, auto_detect_bank
 from brand_config import BRAND_NAME, BRAND_VERSION, BRAND_AUTHOR
 from pdf_password_utils import PDFPasswordHandler
 
+# fitz, pypdfium2 and pdfplumber are imported inside the methods that use them, so
+# listing sessions or reading run history doesn't load the PDF/data stack, and
+# PDF worker processes never load the bank formatters
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+
 # Format the docstring with brand config
 __doc__ = __doc__.format(
     BRAND_NAME=BRAND_NAME,
@@ -49,29 +60,148 @@ __doc__ = __doc__.format(
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# PDFs of a session are extracted in parallel by up to this many processes;
+# PDF parsing stops scaling much beyond four workers
+SESSION_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# main() uses the password in this environment variable for protected PDFs
+# instead of prompting for one
+PDF_PASSWORD_ENV_VAR = "BSA_PDF_PASSWORD"
+
+# zlib level for compressed results; text compresses nearly as well as at the
+# maximum level 9 for a fraction of the CPU time
+RESULTS_GZIP_LEVEL = 6
+
+# Session results cached in cache_dir beyond this many are evicted, least
+# recently used first; main() only caches when SESSION_CACHE_DIR is configured
+SESSION_CACHE_MAX_ENTRIES = 50
+
+# Version of the layout of session results and the comprehensive results file,
+# reported as schema_version. In version 2 each PDF's entry keeps only the
+# span (text_offset, text_length) and counts of its text, tables and images,
+# and the tables are saved to a sidecar file named by tables_file. Version 1
+# (LocalEPdfProcessor(legacy_output=True)) also keeps text_content, tables and
+# images_info in each PDF's entry and embeds all_tables in the results file
+OUTPUT_SCHEMA_VERSION = 2
+LEGACY_OUTPUT_SCHEMA_VERSION = 1
+
+# Source files whose contents make up the code version in session cache
+# signatures, so cached results are dropped when the parsing code changes.
+# Their digests, like those of the session's PDFs, are kept in the session's
+# {session_id}_file_digests.json and only recomputed for files whose size or
+# modification time changed
+CODE_VERSION_SOURCES = ("local_epdf_processor.py", "bank_formatters_main.py", "pdf_password_utils.py",
+                        "bank_formatters/*.py")
+
+# Words found in bank statements; a text-based PDF must contain at least one
+EPDF_TEXT_PATTERN_RE = re.compile(
+    r"transaction|date|amount|balance|debit|credit|narration|reference|upi|neft|imps",
+    re.IGNORECASE
+)
+
+
+def _write_json(f: BinaryIO, obj: Any, stream_depth: int = 2, indent: bytes = b"", compact: bool = False) -> None:
+    """
+    Write obj to a binary file as JSON, one value at a time
+    
+    The output is byte-for-byte what orjson.dumps(obj, option=OPT_INDENT_2 |
+    OPT_NON_STR_KEYS) returns (OPT_NON_STR_KEYS alone when compact), but the
+    first stream_depth levels of dicts and lists are written item by item, so
+    only the largest value below them is ever encoded in memory rather than
+    the whole document.
+    
+    Args:
+        f: Binary file to write to
+        obj: JSON-serializable object
+        stream_depth: Number of container levels written item by item
+        indent: Indentation of the line obj starts on
+        compact: Write JSON without indentation or spaces
+    """
+    is_dict = isinstance(obj, dict)
+    # Dicts with non-string keys are left to orjson, which converts the keys
+    streamable = (is_dict and all(isinstance(key, str) for key in obj)) or isinstance(obj, list)
+    if stream_depth <= 0 or not obj or not streamable:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        data = orjson.dumps(obj, option=option)
+        # Newlines inside JSON strings are escaped, so every raw newline
+        # starts a line that needs the outer indentation
+        f.write(data.replace(b"\n", b"\n" + indent) if indent else data)
+        return
+    
+    newline = b"" if compact else b"\n"
+    child_indent = b"" if compact else indent + b"  "
+    key_separator = b":" if compact else b": "
+    f.write((b"{" if is_dict else b"[") + newline)
+    for item_index, item in enumerate(obj.items() if is_dict else obj):
+        if item_index:
+            f.write(b"," + newline)
+        f.write(child_indent)
+        if is_dict:
+            key, item = item
+            f.write(orjson.dumps(key) + key_separator)
+        _write_json(f, item, stream_depth - 1, child_indent, compact)
+    f.write(newline + indent + (b"}" if is_dict else b"]"))
+
+
+@lru_cache(maxsize=None)
+def _get_code_sources() -> Tuple[Path, ...]:
+    """
+    Extraction and formatting source files (see CODE_VERSION_SOURCES)
+    
+    Returns:
+        Tuple[Path, ...]: Paths of the source files, in a stable order
+    """
+    base_dir = Path(__file__).resolve().parent
+    return tuple(source_path for pattern in CODE_VERSION_SOURCES for source_path in sorted(base_dir.glob(pattern)))
+
 
 class LocalEPdfProcessor:
     """
     A class to handle local ePDF processing from BSA folder structure
     """
     
-    def __init__(self, bsa_folder_path: str = "./BSA"):
+    def __init__(self, bsa_folder_path: str = "./BSA", pdfplumber_table_fallback: bool = False,
+                 compress_results: bool = False, cache_dir: Optional[str] = None,
+                 cache_max_entries: int = SESSION_CACHE_MAX_ENTRIES, extract_images: bool = True,
+                 legacy_output: bool = False):
         """
         Initialize the local ePDF processor
         
         Args:
             bsa_folder_path: Path to the BSA folder containing session IDs
+            pdfplumber_table_fallback: Re-parse PDFs with pdfplumber for tables when
+                                       PyMuPDF finds none
+            compress_results: Write the comprehensive results as compact, gzip-compressed
+                              JSON in {session_id}_extracted_data.json.gz
+            cache_dir: Optional directory for caching session results by the
+                       session's files and processing options
+            cache_max_entries: Number of cached session results kept in cache_dir
+            extract_images: Record per-page image info (images_info); disable to
+                            skip walking every page's image resources
+            legacy_output: Write results in the schema version 1 layout (see
+                           OUTPUT_SCHEMA_VERSION)
         """
         self.bsa_folder_path = Path(bsa_folder_path)
         self.supported_extensions = ['.pdf', '.PDF']
+        self.pdfplumber_table_fallback = pdfplumber_table_fallback
+        self.compress_results = compress_results
+        self.cache_dir = cache_dir
+        self.cache_max_entries = cache_max_entries
+        self.extract_images = extract_images
+        self.legacy_output = legacy_output
+        # session_id -> (session folder, extractedData folder), filled lazily
+        # by get_session_folder and get_extracted_data_folder
+        self._session_folders = {}
+        # extractedData folders already created or verified by this processor
+        self._created_folders = set()
         
         # Validate BSA folder exists
         if not self.bsa_folder_path.exists():
-            logger.warning(f"BSA folder does not exist: {self.bsa_folder_path}")
+            logger.warning("BSA folder does not exist: %s", self.bsa_folder_path)
             logger.info("Creating BSA folder structure...")
             self.bsa_folder_path.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"Local ePDF processor initialized with BSA folder: {self.bsa_folder_path}")
+        logger.info("Local ePDF processor initialized with BSA folder: %s", self.bsa_folder_path)
     
     def is_epdf(self, pdf_path: Path, password: Optional[str] = None) -> bool:
         """
@@ -85,75 +215,102 @@ class LocalEPdfProcessor:
         Returns:
             bool: True if it's an ePDF, False if it's scanned/image or password-protected without password
         """
-        try:
-            # First check if PDF is password protected
-            with open(pdf_path, 'rb') as f:
-                pdf_content = f.read()
-            
-            is_protected = PDFPasswordHandler.is_password_protected(pdf_content)
+        is_valid_epdf, _, _ = self._check_epdf(pdf_path, password)
+        return is_valid_epdf
+    
+    def _check_epdf(self, pdf_path: Path, password: Optional[str] = None) -> Tuple[bool, Optional[bool], Optional[bytes]]:
+        """
+        Run the is_epdf check, keeping the unlocked content of a protected PDF
+        
+        Args:
+            pdf_path: Path to the PDF file
+            password: Optional password for password-protected PDFs
             
-            if is_protected:
-                if password is None:
-                    logger.warning(f"PDF is password protected but no password provided: {pdf_path.name}")
-                    return False  # Treat as invalid if password protected but no password
-                
-                # Try to unlock with password
-                is_valid, error_msg, unlocked_content = PDFPasswordHandler.validate_password_protection(
-                    pdf_content, password
-                )
+        Returns:
+            Tuple[bool, Optional[bool], Optional[bytes]]: The is_epdf result,
+            whether the PDF is password protected (None if the file couldn't
+            be checked), and the unlocked PDF content if the file was password
+            protected and unlocked
+        """
+        import fitz  # PyMuPDF
+        
+        unlocked_content = None
+        try:
+            # Open the file by path so MuPDF reads only the objects it needs
+            # for the check instead of the whole file being copied into memory.
+            # A protected PDF is unlocked on this same document rather than
+            # being parsed again by the password handler
+            with fitz.open(pdf_path, filetype="pdf") as doc:
+                # First check if PDF is password protected
+                is_protected = bool(doc.needs_pass)
+                if is_protected:
+                    if password is None:
+                        logger.warning("PDF is password protected but no password provided: %s", pdf_path.name)
+                        return False, True, None  # Treat as invalid if password protected but no password
+                    
+                    if not doc.authenticate(password):
+                        logger.warning("Failed to unlock password-protected PDF %s: Invalid password provided", pdf_path.name)
+                        return False, True, None
                 
-                if not is_valid:
-                    logger.warning(f"Failed to unlock password-protected PDF {pdf_path.name}: {error_msg}")
-                    return False
+                has_epdf_text, text_length = self._check_epdf_text(doc)
                 
-                # Use unlocked content for text analysis
-                pdf_content = unlocked_content
-            
-            # Open PDF with PyMuPDF (using unlocked content if needed)
-            doc = fitz.open(stream=pdf_content, filetype="pdf")
-            
-            # Check first few pages for text content
-            text_content = ""
-            pages_to_check = min(3, len(doc))  # Check first 3 pages or all pages if less than 3
-            
-            for page_num in range(pages_to_check):
-                page = doc[page_num]
-                text = page.get_text()
-                text_content += text
-            
-            doc.close()
+                # Extraction gets the decrypted content, so it doesn't
+                # unlock the file again
+                if is_protected and has_epdf_text:
+                    unlocked_content = doc.tobytes()
             
-            # Check if we have substantial text content
-            # Scanned PDFs typically have very little or no text
-            text_length = len(text_content.strip())
+            if has_epdf_text:
+                return True, is_protected, unlocked_content
             
-            # Also check for common scanned PDF characteristics
-            has_substantial_text = text_length > 100  # At least 100 characters of text
-            
-            # Additional check: look for common text patterns that indicate ePDF
-            has_text_patterns = any(pattern in text_content.lower() for pattern in [
-                'transaction', 'date', 'amount', 'balance', 'debit', 'credit', 
-                'narration', 'reference', 'upi', 'neft', 'imps'
-            ])
-            
-            is_valid_epdf = has_substantial_text and has_text_patterns
-            
-            if not is_valid_epdf:
-                if is_protected:
-                    logger.warning(f"Password-protected PDF appears to be scanned/image-based: {pdf_path.name} (text length: {text_length})")
-                else:
-                    logger.warning(f"PDF appears to be scanned/image-based: {pdf_path.name} (text length: {text_length})")
+            if is_protected:
+                logger.warning("Password-protected PDF appears to be scanned/image-based: %s (text length: %d)", pdf_path.name, text_length)
+            else:
+                logger.warning("PDF appears to be scanned/image-based: %s (text length: %d)", pdf_path.name, text_length)
             
-            return is_valid_epdf
+            return False, is_protected, None
             
         except Exception as e:
             error_msg = str(e).lower()
             if "encrypted" in error_msg or "password" in error_msg:
-                logger.warning(f"PDF appears to be password protected: {pdf_path.name}")
-                return False  # Treat password-protected PDFs as invalid if no password provided
+                logger.warning("PDF appears to be password protected: %s", pdf_path.name)
+                return False, True, None  # Treat password-protected PDFs as invalid if no password provided
             else:
-                logger.error(f"Error checking PDF type for {pdf_path.name}: {str(e)}")
-                return False
+                logger.error("Error checking PDF type for %s: %s", pdf_path.name, e)
+                return False, None, None
+    
+    def _check_epdf_text(self, doc: "fitz.Document") -> Tuple[bool, int]:
+        """
+        Check the first pages of an open PDF for bank statement text
+        
+        Pages are read one at a time and the check stops at the first page
+        where the text so far qualifies; more text can't undo that.
+        
+        Args:
+            doc: Open, unlocked PyMuPDF document
+            
+        Returns:
+            Tuple[bool, int]: Whether the PDF has ePDF text, and the length of
+            the stripped text that was read
+        """
+        page_texts = []
+        has_pattern = False
+        pages_to_check = min(3, len(doc))  # Check first 3 pages or all pages if less than 3
+        for page in doc.pages(0, pages_to_check):
+            page_text = page.get_text("text", sort=False)
+            page_texts.append(page_text)
+            
+            # Scanned PDFs typically have very little or no text, so require
+            # at least 100 characters of text and a word that indicates an
+            # ePDF bank statement. Only the new page is scanned for the word;
+            # the text is joined and measured once the word has been found
+            if not has_pattern:
+                has_pattern = EPDF_TEXT_PATTERN_RE.search(page_text) is not None
+            if has_pattern:
+                text_length = len("".join(page_texts).strip())
+                if text_length > 100:
+                    return True, text_length
+        
+        return False, len("".join(page_texts).strip())
     
     def get_session_folder(self, session_id: str) -> Path:
         """
@@ -165,7 +322,7 @@ class LocalEPdfProcessor:
         Returns:
             Path: Path to the session folder
         """
-        return self.bsa_folder_path / session_id
+        return self._get_session_folders(session_id)[0]
     
     def get_extracted_data_folder(self, session_id: str) -> Path:
         """
@@ -177,9 +334,25 @@ class LocalEPdfProcessor:
         Returns:
             Path: Path to the extractedData folder within the session
         """
-        session_folder = self.get_session_folder(session_id)
-        extracted_data_folder = session_folder / "extractedData"
-        return extracted_data_folder
+        return self._get_session_folders(session_id)[1]
+    
+    def _get_session_folders(self, session_id: str) -> Tuple[Path, Path]:
+        """
+        Get the session and extractedData folder paths, building them once
+        per session ID
+        
+        Args:
+            session_id: Session ID to look for
+            
+        Returns:
+            Tuple[Path, Path]: Session folder and its extractedData folder
+        """
+        folders = self._session_folders.get(session_id)
+        if folders is None:
+            session_folder = self.bsa_folder_path / session_id
+            folders = (session_folder, session_folder / "extractedData")
+            self._session_folders[session_id] = folders
+        return folders
     
     def create_extracted_data_folder(self, session_id: str) -> Path:
         """
@@ -192,8 +365,12 @@ class LocalEPdfProcessor:
             Path: Path to the created extractedData folder
         """
         extracted_data_folder = self.get_extracted_data_folder(session_id)
+        if extracted_data_folder in self._created_folders:
+            return extracted_data_folder
+        
         extracted_data_folder.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created/verified extractedData folder: {extracted_data_folder}")
+        self._created_folders.add(extracted_data_folder)
+        logger.info("Created/verified extractedData folder: %s", extracted_data_folder)
         return extracted_data_folder
     
     def get_existing_results(self, session_id: str) -> Dict[str, Any]:
@@ -211,12 +388,12 @@ class LocalEPdfProcessor:
         
         if results_file.exists():
             try:
-                with open(results_file, 'r', encoding='utf-8') as f:
-                    existing_results = json.load(f)
-                logger.info(f"Found existing results for session {session_id}")
+                with open(results_file, 'rb') as f:
+                    existing_results = orjson.loads(f.read())
+                logger.info("Found existing results for session %s", session_id)
                 return existing_results
             except Exception as e:
-                logger.warning(f"Failed to read existing results for {session_id}: {str(e)}")
+                logger.warning("Failed to read existing results for %s: %s", session_id, e)
         
         # Return empty structure for new sessions
         return {
@@ -228,6 +405,228 @@ class LocalEPdfProcessor:
             "last_updated": None
         }
     
+    def _get_epdf_cache_key(self, pdf_path: Path) -> str:
+        """
+        Build the is_epdf cache key for a PDF, also used for file digests
+        
+        The key changes whenever the file's size or modification time does.
+        Only unprotected PDFs are cached, so the password plays no part in it.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            str: Cache key
+        """
+        stat = pdf_path.stat()
+        return f"{pdf_path}:{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def load_epdf_cache(self, session_id: str) -> Dict[str, bool]:
+        """
+        Load the cached is_epdf results for a session
+        
+        Args:
+            session_id: Session ID to load the cache for
+            
+        Returns:
+            Dict[str, bool]: is_epdf result per cache key (empty if there is no usable cache)
+        """
+        cache_file = self.get_extracted_data_folder(session_id) / f"{session_id}_epdf_cache.json"
+        if not cache_file.exists():
+            return {}
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            logger.warning("Ignoring unreadable ePDF cache %s: %s", cache_file, e)
+            return {}
+    
+    def save_epdf_cache(self, session_id: str, epdf_cache: Dict[str, bool]) -> None:
+        """
+        Save the is_epdf results for a session
+        
+        Args:
+            session_id: Session ID to save the cache for
+            epdf_cache: is_epdf result per cache key
+        """
+        cache_file = self.create_extracted_data_folder(session_id) / f"{session_id}_epdf_cache.json"
+        try:
+            with open(cache_file, 'wb') as f:
+                f.write(orjson.dumps(epdf_cache))
+        except OSError as e:
+            logger.warning("Failed to write ePDF cache %s: %s", cache_file, e)
+    
+    def load_file_digests(self, session_id: str) -> Dict[str, str]:
+        """
+        Load the cached content digests of a session's PDFs and the code sources
+        
+        Args:
+            session_id: Session ID to load the digests for
+            
+        Returns:
+            Dict[str, str]: Content digest per file cache key (empty if there is no usable cache)
+        """
+        digests_file = self.get_extracted_data_folder(session_id) / f"{session_id}_file_digests.json"
+        if not digests_file.exists():
+            return {}
+        
+        try:
+            with open(digests_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            logger.warning("Ignoring unreadable file digest cache %s: %s", digests_file, e)
+            return {}
+    
+    def save_file_digests(self, session_id: str, file_digests: Dict[str, str]) -> None:
+        """
+        Save the content digests of a session's PDFs and the code sources
+        
+        Args:
+            session_id: Session ID to save the digests for
+            file_digests: Content digest per file cache key
+        """
+        digests_file = self.create_extracted_data_folder(session_id) / f"{session_id}_file_digests.json"
+        try:
+            with open(digests_file, 'wb') as f:
+                f.write(orjson.dumps(file_digests))
+        except OSError as e:
+            logger.warning("Failed to write file digest cache %s: %s", digests_file, e)
+    
+    def _get_session_signature(self, session_id: str, pdf_files: List[Path],
+                               bank_name: Optional[str] = None) -> str:
+        """
+        Build the cache signature of a session run
+        
+        The signature changes whenever the content of the session's PDFs does,
+        or anything else that shapes the result: the extraction and formatting
+        code, the bank and the processing options. Only runs without a
+        password are cached, so the password plays no part in it.
+        
+        File contents are only hashed when a file's size or modification time
+        differs from the last run; otherwise its digest comes from the
+        session's file digest cache.
+        
+        Args:
+            session_id: Session ID
+            pdf_files: PDF files of the session
+            bank_name: Optional bank name
+            
+        Returns:
+            str: Hex digest identifying the run
+        """
+        file_digests = self.load_file_digests(session_id)
+        checked_digests = {}
+        
+        def get_file_digest(path: Path) -> str:
+            cache_key = self._get_epdf_cache_key(path)
+            digest = file_digests.get(cache_key)
+            if digest is None:
+                file_hasher = hashlib.blake2b(digest_size=16)
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        file_hasher.update(chunk)
+                digest = file_hasher.hexdigest()
+            checked_digests[cache_key] = digest
+            return digest
+        
+        code_version = [get_file_digest(source_path) for source_path in _get_code_sources()]
+        hasher = hashlib.blake2b(digest_size=16)
+        options = (session_id, BRAND_VERSION, code_version, bank_name, self.pdfplumber_table_fallback,
+                   self.compress_results, self.extract_images, self.legacy_output)
+        hasher.update(repr(options).encode("utf-8"))
+        for pdf_path in sorted(pdf_files):
+            hasher.update(f"\0{pdf_path.name}\0{get_file_digest(pdf_path)}".encode("utf-8"))
+        
+        # Only the files of this run are kept, so digests of replaced files
+        # don't pile up
+        if checked_digests != file_digests:
+            self.save_file_digests(session_id, checked_digests)
+        return hasher.hexdigest()
+    
+    def load_cached_session(self, signature: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached session result
+        
+        A cached result is only used if it is intact and the results file it
+        points to still exists; anything else counts as a miss.
+        
+        Args:
+            signature: Session signature from _get_session_signature
+            
+        Returns:
+            Optional[Dict[str, Any]]: Cached session result, or None on a miss
+        """
+        cache_path = os.path.join(self.cache_dir, f"{signature}.json")
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable session cache %s: %s", cache_path, e)
+            return None
+        
+        session_results = cached.get("session_results") if isinstance(cached, dict) else None
+        if not isinstance(session_results, dict) or cached.get("signature") != signature:
+            logger.warning("Ignoring corrupt session cache %s", cache_path)
+            return None
+        if not Path(session_results.get("results_file_path", "")).is_file():
+            logger.info("Results file of cached session is gone, reprocessing: %s", cache_path)
+            return None
+        
+        # The modification time records the last use for eviction
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return session_results
+    
+    def save_cached_session(self, signature: str, session_results: Dict[str, Any]) -> None:
+        """
+        Cache a session result and evict the least recently used entries
+        
+        Args:
+            signature: Session signature from _get_session_signature
+            session_results: Result returned by process_session
+        """
+        cache_path = os.path.join(self.cache_dir, f"{signature}.json")
+        # Write to a temporary file first so a crash never leaves a partial cache entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    _write_json(f, {"signature": signature, "session_results": session_results}, stream_depth=3)
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning("Failed to write session cache %s: %s", cache_path, e)
+            return
+        
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                cached_files = [entry for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+            cached_files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in cached_files[self.cache_max_entries:]:
+                os.unlink(entry.path)
+        except OSError as e:
+            logger.warning("Failed to evict old session cache entries: %s", e)
+    
+    def _get_schema_version(self) -> int:
+        """
+        Get the schema version of the results this processor writes
+        
+        Returns:
+            int: LEGACY_OUTPUT_SCHEMA_VERSION with legacy_output, otherwise
+            OUTPUT_SCHEMA_VERSION
+        """
+        if self.legacy_output:
+            return LEGACY_OUTPUT_SCHEMA_VERSION
+        return OUTPUT_SCHEMA_VERSION
+    
     def save_comprehensive_results(self, session_id: str, current_run_data: Dict[str, Any], start_time: float = None, bank_name: Optional[str] = None) -> str:
         """
         Save comprehensive results in a single file with all metadata and extracted text
@@ -241,12 +640,22 @@ class LocalEPdfProcessor:
         Returns:
             str: Path to the saved comprehensive results file
         """
+        # Tables go to a sidecar file next to the results (embedded as
+        # all_tables in the legacy layout); every table is tagged with its
+        # source_file
+        tables_file = f"{session_id}_extracted_tables.json"
+        combined_data = current_run_data.get("combined_data", {})
+        # Read the clock once so both timestamps name the same instant;
+        # processing_datetime is the naive local time
+        processed_at = datetime.now(timezone.utc)
+        
         # Create comprehensive output structure
         comprehensive_data = {
+            "schema_version": self._get_schema_version(),
             "session_info": {
                 "session_id": session_id,
-                "processing_timestamp": str(pd.Timestamp.now()),
-                "processing_datetime": datetime.now().isoformat(),
+                "processing_timestamp": processed_at.isoformat(),
+                "processing_datetime": processed_at.astimezone().replace(tzinfo=None).isoformat(),
                 "bsa_folder": str(self.bsa_folder_path),
                 "session_folder": str(self.get_session_folder(session_id))
             },
@@ -255,16 +664,15 @@ class LocalEPdfProcessor:
                 "pdfs_found": current_run_data.get("pdfs_found", 0),
                 "pdfs_processed": current_run_data.get("pdfs_processed", 0),
                 "pdfs_failed": current_run_data.get("pdfs_failed", 0),
-                "total_pages": current_run_data.get("combined_data", {}).get("total_pages", 0),
-                "total_text_length": current_run_data.get("combined_data", {}).get("total_text_length", 0),
-                "total_tables": current_run_data.get("combined_data", {}).get("total_tables", 0),
-                "total_images": current_run_data.get("combined_data", {}).get("total_images", 0),
+                "total_pages": combined_data.get("total_pages", 0),
+                "total_text_length": combined_data.get("total_text_length", 0),
+                "total_tables": combined_data.get("total_tables", 0),
+                "total_images": combined_data.get("total_images", 0),
                 "extraction_method": current_run_data.get("pdfs", [{}])[0].get("extraction_method", "unknown") if current_run_data.get("pdfs") else "unknown"
             },
-            "all_extracted_text": current_run_data.get("combined_data", {}).get("all_text_content", ""),
-            "all_metadata": current_run_data.get("combined_data", {}).get("all_metadata", []),
-            "all_tables": current_run_data.get("combined_data", {}).get("all_tables", []),
-            "all_images": current_run_data.get("combined_data", {}).get("all_images", []),
+            "all_extracted_text": combined_data.get("all_text_content", ""),
+            "all_metadata": combined_data.get("all_metadata", []),
+            "all_images": combined_data.get("all_images", []),
             "individual_pdfs": current_run_data.get("pdfs", []),
             "processing_details": {
                 "files_processed": [
@@ -273,9 +681,9 @@ class LocalEPdfProcessor:
                         "file_path": pdf.get("file_path", "unknown"),
                         "file_size": pdf.get("file_size", 0),
                         "pages": pdf.get("pages_count", 0),
-                        "text_length": len(pdf.get("text_content", "")),
-                        "tables_count": len(pdf.get("tables", [])),
-                        "images_count": len(pdf.get("images_info", [])),
+                        "text_length": pdf.get("text_length", 0),
+                        "tables_count": pdf.get("tables_count", 0),
+                        "images_count": pdf.get("images_count", 0),
                         "metadata": pdf.get("metadata", {}),
                         "extraction_method": pdf.get("extraction_method", "unknown")
                     }
@@ -287,12 +695,25 @@ class LocalEPdfProcessor:
         # Create extractedData folder
         extracted_data_folder = self.create_extracted_data_folder(session_id)
         
+        if self.legacy_output:
+            comprehensive_data["all_tables"] = combined_data.get("all_tables", [])
+        else:
+            comprehensive_data["tables_file"] = tables_file
+            # Save the tables without indentation to keep the sidecar small
+            with open(extracted_data_folder / tables_file, "wb") as f:
+                f.write(orjson.dumps(combined_data.get("all_tables", [])))
+        
         # Save comprehensive results in a single file
-        comprehensive_file = extracted_data_folder / f"{session_id}_extracted_data.json"
-        with open(comprehensive_file, "w", encoding="utf-8") as f:
-            json.dump(comprehensive_data, f, indent=2, ensure_ascii=False)
+        if self.compress_results:
+            comprehensive_file = extracted_data_folder / f"{session_id}_extracted_data.json.gz"
+            with gzip.open(comprehensive_file, "wb", compresslevel=RESULTS_GZIP_LEVEL) as f:
+                _write_json(f, comprehensive_data, compact=True)
+        else:
+            comprehensive_file = extracted_data_folder / f"{session_id}_extracted_data.json"
+            with open(comprehensive_file, "wb") as f:
+                _write_json(f, comprehensive_data)
         
-        logger.info(f"Saved comprehensive results for session {session_id}: {comprehensive_file}")
+        logger.info("Saved comprehensive results for session %s: %s", session_id, comprehensive_file)
         
         # Run bank-specific formatting function to add transaction structure
         try:
@@ -301,10 +722,10 @@ class LocalEPdfProcessor:
             
             # Save formatted results
             formatted_file = self.save_formatted_results(extracted_data_folder, session_id, formatted_data)
-            logger.info(f"Saved bank-specific formatted transaction data: {formatted_file}")
+            logger.info("Saved bank-specific formatted transaction data: %s", formatted_file)
             
         except Exception as e:
-            logger.error(f"Error formatting transactions: {str(e)}")
+            logger.error("Error formatting transactions: %s", e)
         
         # Calculate and display total processing time
         if start_time is not None:
@@ -312,7 +733,7 @@ class LocalEPdfProcessor:
             total_time = end_time - start_time
             minutes = int(total_time // 60)
             seconds = int(total_time % 60)
-            logger.info(f"⏱️  Total processing time: {minutes:02d}:{seconds:02d}")
+            logger.info("⏱️  Total processing time: %02d:%02d", minutes, seconds)
         
         return str(comprehensive_file)
     
@@ -325,8 +746,10 @@ class LocalEPdfProcessor:
             bank_name: Name of the bank (optional, will auto-detect if not provided)
             
         Returns:
-            Dict[str, Any]: Data with bank-specific formatting applied
+            Dict[str, Any]: extracted_data, updated in place with bank-specific formatting
         """
+        from bank_formatters_main import BankFormatterFactory, auto_detect_bank
+        
         try:
             text_content = extracted_data.get("all_extracted_text", "")
             
@@ -335,7 +758,7 @@ class LocalEPdfProcessor:
                 detected_bank = auto_detect_bank(text_content)
                 if detected_bank:
                     bank_name = detected_bank
-                    logger.info(f"Auto-detected bank: {bank_name}")
+                    logger.info("Auto-detected bank: %s", bank_name)
                 else:
                     logger.warning("Could not auto-detect bank, using generic formatting")
                     return extracted_data
@@ -343,9 +766,9 @@ class LocalEPdfProcessor:
             # Get bank-specific formatter
             try:
                 formatter = BankFormatterFactory.get_formatter(bank_name)
-                logger.info(f"Using {bank_name} formatter")
+                logger.info("Using %s formatter", bank_name)
             except ValueError as e:
-                logger.error(f"Bank formatter error: {str(e)}")
+                logger.error("Bank formatter error: %s", e)
                 logger.info("Falling back to generic formatting")
                 return extracted_data
             
@@ -374,20 +797,20 @@ class LocalEPdfProcessor:
                     "formatted_at": datetime.now().isoformat()
                 }
             
-            # Merge formatted data with original extracted data
-            result = extracted_data.copy()
-            result["bank_specific_data"] = formatted_result
-            result["bank_name"] = bank_name
+            # Add formatted data to the extracted data in place; callers
+            # don't reuse the unformatted dict
+            extracted_data["bank_specific_data"] = formatted_result
+            extracted_data["bank_name"] = bank_name
             
             # Add formatted transactions to main result if successful
             if formatted_result.get("success", False):
-                result["formatted_transactions"] = formatted_result.get("transactions", [])
-                result["total_formatted_transactions"] = formatted_result.get("total_transactions", 0)
+                extracted_data["formatted_transactions"] = formatted_result.get("transactions", [])
+                extracted_data["total_formatted_transactions"] = formatted_result.get("total_transactions", 0)
             
-            return result
+            return extracted_data
             
         except Exception as e:
-            logger.error(f"Error in bank-specific formatting: {str(e)}")
+            logger.error("Error in bank-specific formatting: %s", e)
             # Return original data if formatting fails
             return extracted_data
     
@@ -405,15 +828,24 @@ class LocalEPdfProcessor:
         """
         # Save formatted JSON
         formatted_json_file = extracted_data_folder / f"{session_id}_extracted_data_formatted.json"
-        with open(formatted_json_file, "w", encoding="utf-8") as f:
-            json.dump(formatted_data, f, indent=2, ensure_ascii=False)
+        with open(formatted_json_file, "wb") as f:
+            _write_json(f, formatted_data)
         
         # Save formatted CSV if transactions are available
         if "formatted_transactions" in formatted_data and formatted_data["formatted_transactions"]:
             formatted_csv_file = extracted_data_folder / f"{session_id}_extracted_data_formatted.csv"
-            df = pd.DataFrame(formatted_data["formatted_transactions"])
-            df.to_csv(formatted_csv_file, index=False, encoding="utf-8")
-            logger.info(f"Saved formatted CSV: {formatted_csv_file}")
+            transactions = formatted_data["formatted_transactions"]
+            # Columns in first-seen order across all transactions, as a
+            # DataFrame built from the same records would have them
+            fieldnames = list(dict.fromkeys(key for transaction in transactions for key in transaction))
+            # Build the CSV in memory and encode it once rather than through
+            # a text-mode file
+            csv_buffer = StringIO(newline="")
+            writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(transactions)
+            formatted_csv_file.write_bytes(csv_buffer.getvalue().encode("utf-8"))
+            logger.info("Saved formatted CSV: %s", formatted_csv_file)
         
         return str(formatted_json_file)
     
@@ -428,7 +860,7 @@ class LocalEPdfProcessor:
             bool: True if session exists, False otherwise
         """
         session_folder = self.get_session_folder(session_id)
-        return session_folder.exists() and session_folder.is_dir()
+        return session_folder.is_dir()
     
     def get_session_pdfs(self, session_id: str) -> List[Path]:
         """
@@ -444,22 +876,19 @@ class LocalEPdfProcessor:
             return []
         
         session_folder = self.get_session_folder(session_id)
-        pdf_files = []
-        
-        # Find all PDF files in the session folder
-        for extension in self.supported_extensions:
-            pattern = f"*{extension}"
-            pdf_files.extend(session_folder.glob(pattern))
         
-        # Also check subdirectories if any
-        for extension in self.supported_extensions:
-            pattern = f"**/*{extension}"
-            pdf_files.extend(session_folder.glob(pattern))
-        
-        # Remove duplicates and sort
-        pdf_files = sorted(list(set(pdf_files)))
-        
-        logger.info(f"Found {len(pdf_files)} PDF files for session: {session_id}")
+        # Find all PDF files in the session folder and its subdirectories in
+        # one walk; extensions are compared case-insensitively, and a Path is
+        # only built for the files that match
+        extensions = tuple({extension.lower() for extension in self.supported_extensions})
+        pdf_files = sorted(
+            Path(root, name)
+            for root, _, file_names in os.walk(session_folder)
+            for name in file_names
+            if name.lower().endswith(extensions)
+        )
+        
+        logger.info("Found %d PDF files for session: %s", len(pdf_files), session_id)
         return pdf_files
     
     def read_pdf_file(self, pdf_path: Path) -> bytes:
@@ -475,25 +904,54 @@ class LocalEPdfProcessor:
         try:
             with open(pdf_path, 'rb') as f:
                 pdf_content = f.read()
-            logger.info(f"Successfully read PDF: {pdf_path.name}")
+            logger.info("Successfully read PDF: %s", pdf_path.name)
             return pdf_content
         except Exception as e:
-            logger.error(f"Failed to read PDF {pdf_path}: {str(e)}")
+            logger.error("Failed to read PDF %s: %s", pdf_path, e)
             raise
     
-    def extract_data_from_epdf(self, pdf_content: bytes, pdf_name: str = "unknown", password: Optional[str] = None) -> Dict[str, Any]:
+    def prefetch_pdf_files(self, pdf_files: List[Path]) -> None:
+        """
+        Ask the OS to start reading PDF files into the page cache
+        
+        The reads happen asynchronously in the kernel, so the files of a
+        session are fetched from disk together while earlier PDFs are being
+        parsed, and read_pdf_file later finds them in memory. Does nothing on
+        platforms without posix_fadvise.
+        
+        Args:
+            pdf_files: PDF files that are about to be read
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        
+        for pdf_path in pdf_files:
+            try:
+                fd = os.open(pdf_path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                logger.debug("Could not prefetch %s: %s", pdf_path.name, e)
+    
+    def extract_data_from_epdf(self, pdf_content: Union[bytes, memoryview], pdf_name: str = "unknown",
+                               password: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract data from ePDF content and return as JSON
         (Same as original EPdfProcessor but with additional file info)
         
         Args:
-            pdf_content: PDF content as bytes
+            pdf_content: PDF content as bytes, or a memoryview of a mapped file
             pdf_name: Name of the PDF file for logging
             password: Optional password for password-protected PDFs
             
         Returns:
             Dict[str, Any]: Extracted data as dictionary
         """
+        import fitz  # PyMuPDF
+        import pypdfium2 as pdfium
+        
         extracted_data = {
             "metadata": {},
             "text_content": "",
@@ -504,106 +962,233 @@ class LocalEPdfProcessor:
             "pdf_name": pdf_name
         }
         
+        # Password that pdf_content needs, if it is still encrypted
+        content_password = None
         try:
-            # Check if PDF is password protected and unlock if needed
-            logger.info(f"Validating password protection for {pdf_name} (password provided: {password is not None})")
-            is_valid, error_msg, unlocked_content = PDFPasswordHandler.validate_password_protection(
-                pdf_content, password
-            )
-            
-            if not is_valid:
-                logger.error(f"Password protection error for {pdf_name}: {error_msg}")
-                # Provide more specific error messages
-                if "Password Protected File" in error_msg:
-                    raise ValueError(f"{pdf_name}: Password Protected File - Please provide a password to unlock this PDF")
-                elif "Invalid password" in error_msg:
-                    raise ValueError(f"{pdf_name}: Invalid password provided - Please check the password and try again")
-                else:
-                    raise ValueError(f"{pdf_name}: PDF processing error - {error_msg}")
-            
-            # Use unlocked content for processing
-            pdf_content = unlocked_content
-            logger.info(f"PDF {pdf_name} successfully validated/unlocked, proceeding with extraction")
-            # Method 1: Using PyMuPDF (fitz) for comprehensive extraction
+            # Method 1: Using PyMuPDF (fitz) for comprehensive extraction.
+            # A protected PDF is unlocked on the document opened here instead
+            # of being decrypted to new bytes and parsed again
             pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
-            extracted_data["pages_count"] = len(pdf_document)
-            
-            # Extract metadata
-            metadata = pdf_document.metadata
-            extracted_data["metadata"] = {
-                "title": metadata.get("title", ""),
-                "author": metadata.get("author", ""),
-                "subject": metadata.get("subject", ""),
-                "creator": metadata.get("creator", ""),
-                "producer": metadata.get("producer", ""),
-                "creation_date": metadata.get("creationDate", ""),
-                "modification_date": metadata.get("modDate", "")
-            }
-            
-            # Extract text content
-            full_text = ""
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                text = page.get_text()
-                full_text += f"\n--- Page {page_num + 1} ---\n{text}"
+            if pdf_document.needs_pass:
+                logger.info("Unlocking password-protected PDF %s (password provided: %s)", pdf_name, password is not None)
+                if password is None or not pdf_document.authenticate(password):
+                    pdf_document.close()
+                    if password is None:
+                        error_msg = f"{pdf_name}: Password Protected File - Please provide a password to unlock this PDF"
+                    else:
+                        error_msg = f"{pdf_name}: Invalid password provided - Please check the password and try again"
+                    logger.error("Password protection error for %s: %s", pdf_name, error_msg)
+                    raise ValueError(error_msg)
                 
-                # Extract images info
-                image_list = page.get_images()
-                for img_index, img in enumerate(image_list):
-                    extracted_data["images_info"].append({
-                        "page": page_num + 1,
-                        "image_index": img_index,
-                        "xref": img[0],
-                        "smask": img[1],
-                        "width": img[2],
-                        "height": img[3],
-                        "bpc": img[4],
-                        "colorspace": img[5],
-                        "alt": img[6],
-                        "name": img[7],
-                        "filter": img[8]
-                    })
-            
-            extracted_data["text_content"] = full_text.strip()
-            pdf_document.close()
+                # The fallbacks below read pdf_content themselves, so they
+                # need the password too
+                content_password = password
+                logger.info("PDF %s successfully unlocked, proceeding with extraction", pdf_name)
             
-            # Method 2: Using pdfplumber for table extraction
-            with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+            with pdf_document:
+                extracted_data["pages_count"] = len(pdf_document)
+                
+                # Extract metadata
+                metadata = pdf_document.metadata
+                extracted_data["metadata"] = {
+                    "title": metadata.get("title", ""),
+                    "author": metadata.get("author", ""),
+                    "subject": metadata.get("subject", ""),
+                    "creator": metadata.get("creator", ""),
+                    "producer": metadata.get("producer", ""),
+                    "creation_date": metadata.get("creationDate", ""),
+                    "modification_date": metadata.get("modDate", "")
+                }
+                
+                # Extract text content, images info and tables in a single pass
+                page_texts = []
                 tables = []
-                for page_num, page in enumerate(pdf.pages):
-                    page_tables = page.extract_tables()
-                    for table_index, table in enumerate(page_tables):
-                        tables.append({
-                            "page": page_num + 1,
+                # Bind the per-page appends once and iterate the document
+                # directly instead of indexing it
+                append_text = page_texts.append
+                append_table = tables.append
+                append_image = extracted_data["images_info"].append
+                extract_images = self.extract_images
+                # Plain-text flags with ligatures expanded into their letters
+                text_flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+                # Pages stay on this thread: PyMuPDF holds the GIL and a
+                # Document can't be shared between threads, so a page thread
+                # pool only adds overhead. process_session runs PDFs in
+                # separate processes instead
+                for page_number, page in enumerate(pdf_document, 1):
+                    text = page.get_textpage(flags=text_flags).extractText(sort=False)
+                    append_text(f"\n--- Page {page_number} ---\n{text}")
+                    
+                    # Extract tables
+                    for table_index, table in enumerate(page.find_tables()):
+                        append_table({
+                            "page": page_number,
                             "table_index": table_index,
-                            "data": table
+                            "data": table.extract()
                         })
+                    
+                    # Extract images info
+                    if not extract_images:
+                        continue
+                    for img_index, img in enumerate(page.get_images()):
+                        append_image({
+                            "page": page_number,
+                            "image_index": img_index,
+                            "xref": img[0],
+                            "smask": img[1],
+                            "width": img[2],
+                            "height": img[3],
+                            "bpc": img[4],
+                            "colorspace": img[5],
+                            "alt": img[6],
+                            "name": img[7],
+                            "filter": img[8]
+                        })
+                
+                extracted_data["text_content"] = "".join(page_texts).strip()
                 extracted_data["tables"] = tables
+                
+                # pdfplumber re-parses the whole document, so it only runs
+                # when enabled and PyMuPDF's table finder came back empty. It
+                # runs while the document is still open so its page probe
+                # reuses it
+                if not tables and self.pdfplumber_table_fallback:
+                    extracted_data["tables"] = self._extract_tables_with_pdfplumber(pdf_content, pdf_document, content_password)
+                    logger.info("PyMuPDF found no tables in %s, pdfplumber found %d", pdf_name, len(extracted_data['tables']))
             
-            logger.info(f"Successfully extracted data from {pdf_name} with {extracted_data['pages_count']} pages")
+            logger.info("Successfully extracted data from %s with %d pages", pdf_name, extracted_data['pages_count'])
             
         except Exception as e:
-            logger.error(f"Error extracting data from {pdf_name}: {str(e)}")
-            # Fallback to basic PyPDF2 extraction
+            logger.error("Error extracting data from %s: %s", pdf_name, e)
+            # Fallback to basic PDFium text extraction
             try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
-                extracted_data["pages_count"] = len(pdf_reader.pages)
-                extracted_data["extraction_method"] = "fallback_pypdf2"
-                
-                text_content = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text_content += f"\n--- Page {page_num + 1} ---\n{page.extract_text()}"
+                # PDFium doesn't accept a memoryview; bytes input is passed
+                # through as is
+                pdf = pdfium.PdfDocument(bytes(pdf_content), password=content_password)
+                try:
+                    extracted_data["pages_count"] = len(pdf)
+                    extracted_data["extraction_method"] = "fallback_pdfium"
+                    
+                    page_texts = []
+                    for page_num in range(len(pdf)):
+                        page = pdf[page_num]
+                        textpage = page.get_textpage()
+                        try:
+                            # PDFium separates lines with \r\n
+                            text = textpage.get_text_range().replace("\r\n", "\n")
+                            page_texts.append(f"\n--- Page {page_num + 1} ---\n{text}")
+                        finally:
+                            textpage.close()
+                            page.close()
+                finally:
+                    pdf.close()
                 
-                extracted_data["text_content"] = text_content.strip()
-                logger.info(f"Used fallback PyPDF2 extraction method for {pdf_name}")
+                extracted_data["text_content"] = "".join(page_texts).strip()
+                logger.info("Used fallback PDFium extraction method for %s", pdf_name)
                 
             except Exception as fallback_error:
-                logger.error(f"Fallback extraction also failed for {pdf_name}: {str(fallback_error)}")
+                logger.error("Fallback extraction also failed for %s: %s", pdf_name, fallback_error)
                 raise
         
         return extracted_data
     
-    def process_session(self, session_id: str, password: Optional[str] = None, bank_name: Optional[str] = None) -> Dict[str, Any]:
+    def _process_pdf_file(self, pdf_path: Path, password: Optional[str] = None,
+                          unlocked_content: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        Extract a single, already validated PDF of a session
+        
+        Runs in a process pool worker from process_session, so failures are
+        returned rather than raised.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            password: Optional password for password-protected PDFs
+            unlocked_content: Content of the PDF already unlocked by the ePDF
+                              check, used instead of reading the file
+            
+        Returns:
+            Dict[str, Any]: Extracted data with file info, or a failure record
+            with "error" set
+        """
+        try:
+            logger.info("Processing PDF: %s", pdf_path.name)
+            
+            # process_session has already rejected sessions containing
+            # scanned or locked PDFs, so the ePDF check isn't repeated here
+            
+            if unlocked_content is not None:
+                extracted_data = self.extract_data_from_epdf(unlocked_content, pdf_path.name, password)
+                file_size = pdf_path.stat().st_size
+            else:
+                # Map the file instead of reading it into a bytes object;
+                # PyMuPDF parses the mapped pages in place, so large
+                # statements are never copied into process memory
+                with open(pdf_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pdf_map, \
+                        memoryview(pdf_map) as pdf_content:
+                    extracted_data = self.extract_data_from_epdf(pdf_content, pdf_path.name, password)
+                    file_size = len(pdf_content)
+            
+            # Add file path info
+            extracted_data["file_path"] = str(pdf_path)
+            extracted_data["file_size"] = file_size
+            
+            # Tag tables and images with their file here so process_session
+            # can add them to the combined data as they are
+            for table in extracted_data["tables"]:
+                table["source_file"] = pdf_path.name
+            for image in extracted_data["images_info"]:
+                image["source_file"] = pdf_path.name
+            
+            logger.info("Successfully processed: %s", pdf_path.name)
+            return extracted_data
+            
+        except Exception as e:
+            logger.error("Failed to process %s: %s", pdf_path.name, e)
+            return {
+                "file_name": pdf_path.name,
+                "file_path": str(pdf_path),
+                "error": str(e),
+                "success": False
+            }
+    
+    def _extract_tables_with_pdfplumber(self, pdf_content: bytes, pdf_document: "fitz.Document",
+                                        password: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Extract tables with pdfplumber
+        
+        pdfplumber finds tables from ruling lines, so pages without any
+        vector drawings (cover pages, terms and conditions) are skipped
+        using a cheap probe of the already open PyMuPDF document instead of
+        being parsed by pdfplumber. Both documents are walked in lockstep.
+        
+        Args:
+            pdf_content: PDF content as bytes
+            pdf_document: The same PDF, open (and unlocked) in PyMuPDF
+            password: Password for pdf_content if it is encrypted
+            
+        Returns:
+            List[Dict[str, Any]]: Tables with page number, index and cell data
+        """
+        import pdfplumber
+        
+        tables = []
+        with pdfplumber.open(BytesIO(pdf_content), password=password) as pdf:
+            for page_number, (fitz_page, page) in enumerate(zip(pdf_document, pdf.pages), 1):
+                if not fitz_page.get_cdrawings():
+                    continue
+                for table_index, table in enumerate(page.extract_tables()):
+                    tables.append({
+                        "page": page_number,
+                        "table_index": table_index,
+                        "data": table
+                    })
+                # Drop the page's parsed layout before moving on
+                page.close()
+        return tables
+    
+    def process_session(self, session_id: str, password: Optional[str] = None, bank_name: Optional[str] = None,
+                        num_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all ePDFs for a given session ID
         
@@ -611,12 +1196,20 @@ class LocalEPdfProcessor:
             session_id: Session ID to process
             password: Optional password for password-protected PDFs
             bank_name: Optional bank name (HDFC, ICICI, SBI) or None for auto-detect
+            num_workers: Worker processes used to extract the session's PDFs
+                         (defaults to SESSION_MAX_WORKERS)
             
         Returns:
-            Dict[str, Any]: Combined extracted data from all PDFs in the session
+            Dict[str, Any]: Combined extracted data from all PDFs in the session. Each
+            processed PDF's text is the text_length characters of
+            combined_data["all_text_content"] starting at its text_offset; its
+            tables and images are the entries of combined_data["all_tables"]
+            and ["all_images"] with its file name as source_file. With
+            legacy_output the entry also keeps its text_content, tables and
+            images_info
         """
         start_time = time.time()
-        logger.info(f"Starting session processing for: {session_id}")
+        logger.info("Starting session processing for: %s", session_id)
         
         # Check if session exists
         if not self.session_exists(session_id):
@@ -641,22 +1234,64 @@ class LocalEPdfProcessor:
                 "pdfs_found": 0
             }
         
-        # Validate all PDFs are ePDFs before processing
+        # Reuse the result of an earlier run over the same files and options.
+        # Runs with a password are never cached, so unlocked results are
+        # not served to callers without it
+        session_signature = None
+        if self.cache_dir and password is None:
+            session_signature = self._get_session_signature(session_id, pdf_files, bank_name)
+            cached_results = self.load_cached_session(session_signature)
+            if cached_results is not None:
+                logger.info("Using cached results for session %s", session_id)
+                return cached_results
+        
+        # Validate all PDFs are ePDFs before processing; results from earlier
+        # runs are reused for files that haven't changed since
         scanned_pdfs = []
         password_protected_pdfs = []
+        epdf_cache = self.load_epdf_cache(session_id)
+        checked_epdfs = {}
+        # Content of protected PDFs unlocked by the check, so extraction
+        # doesn't read and decrypt them a second time
+        unlocked_contents = {}
         for pdf_path in pdf_files:
-            if not self.is_epdf(pdf_path, password):
-                # Check if it's password protected
+            cache_key = self._get_epdf_cache_key(pdf_path)
+            is_valid_epdf = epdf_cache.get(cache_key)
+            # Whether the PDF is protected, as found by the check; unknown for
+            # cached results
+            is_protected = None
+            if is_valid_epdf is None:
+                is_valid_epdf, is_protected, unlocked_content = self._check_epdf(pdf_path, password)
+                if unlocked_content is not None:
+                    unlocked_contents[pdf_path] = unlocked_content
+                # The result for a protected PDF depends on the password, so
+                # only PDFs known to be unprotected are cached
+                if is_protected is False:
+                    checked_epdfs[cache_key] = is_valid_epdf
+            else:
+                checked_epdfs[cache_key] = is_valid_epdf
+            
+            if is_valid_epdf:
+                continue
+            
+            # Check if it's password protected, unless the check above
+            # already found out
+            if is_protected is None:
                 try:
                     with open(pdf_path, 'rb') as f:
                         pdf_content = f.read()
                     is_protected = PDFPasswordHandler.is_password_protected(pdf_content)
-                    if is_protected:
-                        password_protected_pdfs.append(pdf_path.name)
-                    else:
-                        scanned_pdfs.append(pdf_path.name)
                 except Exception:
-                    scanned_pdfs.append(pdf_path.name)
+                    is_protected = False
+            
+            if is_protected:
+                password_protected_pdfs.append(pdf_path.name)
+            else:
+                scanned_pdfs.append(pdf_path.name)
+        
+        # Entries for removed or modified files are dropped on rewrite
+        if checked_epdfs != epdf_cache:
+            self.save_epdf_cache(session_id, checked_epdfs)
         
         if password_protected_pdfs:
             error_msg = f"Password Protected File - The following files are password protected: {', '.join(password_protected_pdfs)}. Please provide a password to unlock these PDFs."
@@ -687,7 +1322,8 @@ class LocalEPdfProcessor:
             "pdfs_found": len(pdf_files),
             "pdfs_processed": 0,
             "pdfs_failed": 0,
-            "processing_timestamp": str(pd.Timestamp.now()),
+            "processing_timestamp": datetime.now(timezone.utc).isoformat(),
+            "schema_version": self._get_schema_version(),
             "pdfs": [],
             "combined_data": {
                 "total_pages": 0,
@@ -700,86 +1336,81 @@ class LocalEPdfProcessor:
                 "all_images": []
             }
         }
-        
-        for pdf_path in pdf_files:
-            try:
-                logger.info(f"Processing PDF: {pdf_path.name}")
-                
-                # Check if PDF is a true ePDF (text-based) and not scanned/image
-                if not self.is_epdf(pdf_path, password):
-                    # Check if it's password protected
-                    try:
-                        with open(pdf_path, 'rb') as f:
-                            pdf_content = f.read()
-                        is_protected = PDFPasswordHandler.is_password_protected(pdf_content)
-                        if is_protected:
-                            error_msg = f"Password Protected File - File '{pdf_path.name}' is password protected. Please provide a password to unlock this PDF."
-                        else:
-                            error_msg = f"Please pass ePDFs for processing. File '{pdf_path.name}' appears to be a scanned/image PDF."
-                    except Exception:
-                        error_msg = f"Please pass ePDFs for processing. File '{pdf_path.name}' appears to be a scanned/image PDF."
-                    
-                    logger.error(error_msg)
-                    session_results["pdfs_failed"] += 1
-                    session_results["pdfs"].append({
-                        "file_name": pdf_path.name,
-                        "file_path": str(pdf_path),
-                        "error": error_msg,
-                        "success": False
-                    })
-                    continue
-                
-                # Read PDF content
-                pdf_content = self.read_pdf_file(pdf_path)
-                
-                # Extract data
-                extracted_data = self.extract_data_from_epdf(pdf_content, pdf_path.name, password)
-                
-                # Add file path info
-                extracted_data["file_path"] = str(pdf_path)
-                extracted_data["file_size"] = len(pdf_content)
-                
-                # Add to session results
-                session_results["pdfs"].append(extracted_data)
-                session_results["pdfs_processed"] += 1
-                
-                # Update combined data
-                session_results["combined_data"]["total_pages"] += extracted_data["pages_count"]
-                session_results["combined_data"]["total_text_length"] += len(extracted_data["text_content"])
-                session_results["combined_data"]["total_tables"] += len(extracted_data["tables"])
-                session_results["combined_data"]["total_images"] += len(extracted_data["images_info"])
-                
-                # Combine text content
-                session_results["combined_data"]["all_text_content"] += f"\n\n=== {pdf_path.name} ===\n"
-                session_results["combined_data"]["all_text_content"] += extracted_data["text_content"]
-                
-                # Combine metadata
-                session_results["combined_data"]["all_metadata"].append({
-                    "file_name": pdf_path.name,
-                    "metadata": extracted_data["metadata"]
-                })
-                
-                # Combine tables
-                for table in extracted_data["tables"]:
-                    table["source_file"] = pdf_path.name
-                    session_results["combined_data"]["all_tables"].append(table)
-                
-                # Combine images
-                for image in extracted_data["images_info"]:
-                    image["source_file"] = pdf_path.name
-                    session_results["combined_data"]["all_images"].append(image)
-                
-                logger.info(f"Successfully processed: {pdf_path.name}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_path.name}: {str(e)}")
+        combined_data = session_results["combined_data"]
+        text_parts = []
+        combined_text_length = 0
+        
+        # Start reading every PDF from disk now rather than one at a time as
+        # each worker gets to it
+        self.prefetch_pdf_files(pdf_files)
+        
+        # PDFs are independent, so they are checked and extracted in worker
+        # processes; results are combined here in file order
+        max_workers = min(num_workers or SESSION_MAX_WORKERS, len(pdf_files))
+        if max_workers > 1:
+            # Hand out the largest files first so one big statement doesn't
+            # start last and leave the other workers idle while it finishes
+            largest_first = sorted(pdf_files, key=lambda pdf_path: pdf_path.stat().st_size, reverse=True)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results_by_path = dict(zip(
+                    largest_first,
+                    executor.map(self._process_pdf_file, largest_first, repeat(password),
+                                 [unlocked_contents.get(pdf_path) for pdf_path in largest_first])
+                ))
+            pdf_results = [results_by_path[pdf_path] for pdf_path in pdf_files]
+        else:
+            pdf_results = [self._process_pdf_file(pdf_path, password, unlocked_contents.get(pdf_path))
+                           for pdf_path in pdf_files]
+        
+        # The results are already a list in file order, so they become the
+        # session's pdfs as is; the loop below only updates them in place
+        session_results["pdfs"] = pdf_results
+        for pdf_path, extracted_data in zip(pdf_files, pdf_results):
+            if "error" in extracted_data:
                 session_results["pdfs_failed"] += 1
-                session_results["pdfs"].append({
-                    "file_name": pdf_path.name,
-                    "file_path": str(pdf_path),
-                    "error": str(e),
-                    "success": False
-                })
+                continue
+            
+            session_results["pdfs_processed"] += 1
+            
+            # Update combined data
+            combined_data["total_pages"] += extracted_data["pages_count"]
+            combined_data["total_text_length"] += len(extracted_data["text_content"])
+            if self.legacy_output:
+                tables = extracted_data["tables"]
+                images_info = extracted_data["images_info"]
+                text_content = extracted_data["text_content"]
+            else:
+                tables = extracted_data.pop("tables")
+                images_info = extracted_data.pop("images_info")
+                text_content = extracted_data.pop("text_content")
+            combined_data["total_tables"] += len(tables)
+            combined_data["total_images"] += len(images_info)
+            
+            # Combine text content. The PDF's own entry keeps only the span
+            # of its text within all_text_content rather than a second copy
+            # (unless legacy_output keeps both)
+            header = f"\n\n=== {pdf_path.name} ===\n"
+            text_parts.append(header)
+            text_parts.append(text_content)
+            extracted_data["text_offset"] = combined_text_length + len(header)
+            extracted_data["text_length"] = len(text_content)
+            combined_text_length += len(header) + len(text_content)
+            
+            # Combine metadata
+            combined_data["all_metadata"].append({
+                "file_name": pdf_path.name,
+                "metadata": extracted_data["metadata"]
+            })
+            
+            # Combine tables and images, already tagged with source_file. As
+            # with the text, the PDF's own entry keeps only their counts so
+            # each table and image is stored (and serialized) once
+            combined_data["all_tables"].extend(tables)
+            combined_data["all_images"].extend(images_info)
+            extracted_data["tables_count"] = len(tables)
+            extracted_data["images_count"] = len(images_info)
+        
+        combined_data["all_text_content"] = "".join(text_parts)
         
         # Determine overall success
         if session_results["pdfs_failed"] == len(pdf_files):
@@ -788,7 +1419,7 @@ class LocalEPdfProcessor:
         elif session_results["pdfs_failed"] > 0:
             session_results["warning"] = f"{session_results['pdfs_failed']} out of {len(pdf_files)} PDFs failed to process"
         
-        logger.info(f"Session processing completed for {session_id}: {session_results['pdfs_processed']}/{len(pdf_files)} PDFs processed successfully")
+        logger.info("Session processing completed for %s: %d/%d PDFs processed successfully", session_id, session_results['pdfs_processed'], len(pdf_files))
         
         # Save comprehensive results in single file
         if session_results["success"] or session_results["pdfs_processed"] > 0:
@@ -798,29 +1429,9 @@ class LocalEPdfProcessor:
             
             # Add bank-specific data for balance validation report
             try:
-                # Load the comprehensive data to get bank-specific formatting
-                comprehensive_data = {
-                    "session_info": session_results.get("session_info", {}),
-                    "extraction_summary": {
-                        "success": session_results.get("success", False),
-                        "pdfs_found": session_results.get("pdfs_found", 0),
-                        "pdfs_processed": session_results.get("pdfs_processed", 0),
-                        "pdfs_failed": session_results.get("pdfs_failed", 0),
-                        "total_pages": session_results.get("combined_data", {}).get("total_pages", 0),
-                        "total_text_length": session_results.get("combined_data", {}).get("total_text_length", 0),
-                        "total_tables": session_results.get("combined_data", {}).get("total_tables", 0),
-                        "total_images": session_results.get("combined_data", {}).get("total_images", 0),
-                    },
-                    "all_extracted_text": session_results.get("combined_data", {}).get("all_text_content", ""),
-                    "all_metadata": session_results.get("combined_data", {}).get("all_metadata", []),
-                    "all_tables": session_results.get("combined_data", {}).get("all_tables", []),
-                    "all_images": session_results.get("combined_data", {}).get("all_images", []),
-                    "individual_pdfs": session_results.get("pdfs", []),
-                    "processing_details": {
-                        "processing_timestamp": session_results.get("processing_timestamp", ""),
-                        "total_processing_time": time.time() - start_time if start_time else 0
-                    }
-                }
+                # The formatter only reads the extracted text, so it gets that
+                # rather than a copy of the whole comprehensive structure
+                comprehensive_data = {"all_extracted_text": combined_data["all_text_content"]}
                 
                 # Apply bank-specific formatting
                 formatted_data = self.format_with_bank_specific_parser(comprehensive_data, bank_name)
@@ -836,7 +1447,10 @@ class LocalEPdfProcessor:
                     self.save_formatted_results(extracted_data_folder, session_id, formatted_data["bank_specific_data"])
                 
             except Exception as e:
-                logger.error(f"Error adding bank-specific data: {str(e)}")
+                logger.error("Error adding bank-specific data: %s", e)
+        
+        if session_signature and session_results["success"]:
+            self.save_cached_session(session_signature, session_results)
         
         return session_results
     
@@ -850,12 +1464,16 @@ class LocalEPdfProcessor:
         sessions = []
         
         if self.bsa_folder_path.exists():
-            for item in self.bsa_folder_path.iterdir():
-                if item.is_dir():
-                    sessions.append(item.name)
+            # scandir entries carry the file type from the directory read, so
+            # is_dir() doesn't stat each entry
+            with os.scandir(self.bsa_folder_path) as entries:
+                sessions = [entry.name for entry in entries if entry.is_dir()]
         
         sessions.sort()
-        logger.info(f"Found {len(sessions)} sessions: {sessions}")
+        # The full list can be long on large BSA folders, so it is only
+        # logged at DEBUG level
+        logger.info("Found %d sessions", len(sessions))
+        logger.debug("Sessions: %s", sessions)
         return sessions
     
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
@@ -878,8 +1496,10 @@ class LocalEPdfProcessor:
         pdf_files = self.get_session_pdfs(session_id)
         extracted_data_folder = self.get_extracted_data_folder(session_id)
         
-        # Check if comprehensive results file exists
+        # Check if comprehensive results file exists, plain or compressed
         comprehensive_file = extracted_data_folder / f"{session_id}_extracted_data.json"
+        if not comprehensive_file.exists():
+            comprehensive_file = extracted_data_folder / f"{session_id}_extracted_data.json.gz"
         has_extracted_data = comprehensive_file.exists()
         
         summary = {
@@ -932,27 +1552,49 @@ class LocalEPdfProcessor:
         if not extracted_data_folder.exists():
             return []
         
-        # Get all JSON files in the extractedData folder
-        json_files = list(extracted_data_folder.glob("*.json"))
-        return [str(f) for f in sorted(json_files)]
+        # Get all JSON files in the extractedData folder, including compressed
+        # results, from a single directory read
+        with os.scandir(extracted_data_folder) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.name.endswith((".json", ".json.gz")) and entry.is_file()
+            )
 
 
 def main():
     """
     Main function to run the local ePDF processor with session selection
     """
-    import sys
-    import getpass
+    import argparse
     
-    # Initialize processor
-    processor = LocalEPdfProcessor("./BSA")
+    from config import Config
+    
+    # Everything the prompts ask for can be given on the command line so
+    # batch runs (e.g. one process per session via xargs -P) never block
+    parser = argparse.ArgumentParser(description=f"{BRAND_NAME} local ePDF processor")
+    parser.add_argument("session_id", nargs="?", help="Session to process (prompted for when omitted)")
+    parser.add_argument("--bank", type=str.upper, choices=["HDFC", "ICICI", "SBI", "AUTO"],
+                        help="Bank formatter to use (AUTO for auto-detection)")
+    parser.add_argument("--no-password", action="store_true",
+                        help="Skip the password prompt for password-protected PDFs")
+    # The password itself is never a command-line argument, where it would
+    # show up in the process list and shell history
+    pdf_password = os.environ.get(PDF_PASSWORD_ENV_VAR)
+    args = parser.parse_args()
+    
+    # Initialize processor; with SESSION_CACHE_DIR set, re-running an
+    # unchanged session reuses its result
+    processor = LocalEPdfProcessor("./BSA", compress_results=Config.COMPRESS_RESULTS, cache_dir=Config.SESSION_CACHE_DIR,
+                                   extract_images=Config.EXTRACT_IMAGES, legacy_output=Config.LEGACY_OUTPUT)
     
     # List all available sessions
     logger.info("Available Sessions:")
     sessions = processor.list_all_sessions()
-    logger.info(f"Found {len(sessions)} sessions: {sessions}")
+    # Session IDs are checked against this one scan instead of hitting the
+    # filesystem again
+    session_ids = set(sessions)
     for session in sessions:
-        logger.info(f"  - {session}")
+        logger.info("  - %s", session)
     
     if not sessions:
         logger.info("No sessions found. Creating example structure...")
@@ -962,14 +1604,19 @@ def main():
         session_folder = processor.get_session_folder(example_session)
         session_folder.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"Created example session folder: {session_folder}")
+        logger.info("Created example session folder: %s", session_folder)
         logger.info("Please add PDF files to this folder and run the script again.")
         return
     
     # Check if session ID is provided as command line argument
-    if len(sys.argv) > 1:
-        session_id = sys.argv[1]
-        logger.info(f"Processing specified session: {session_id}")
+    if args.session_id:
+        session_id = args.session_id
+        # Fail before prompting for anything else
+        if session_id not in session_ids:
+            logger.error("Session '%s' does not exist!", session_id)
+            logger.info("Available sessions: %s", ', '.join(sessions))
+            return
+        logger.info("Processing specified session: %s", session_id)
     else:
         # Interactive mode - ask user to choose
         print("\n" + "="*50)
@@ -993,7 +1640,7 @@ def main():
                         print(f"Please enter a number between 1 and {len(sessions)}")
                 else:
                     # Check if it's a valid session name
-                    if choice in sessions:
+                    if choice in session_ids:
                         session_id = choice
                         break
                     else:
@@ -1002,107 +1649,128 @@ def main():
             except KeyboardInterrupt:
                 print("\nOperation cancelled.")
                 return
+            except EOFError:
+                # stdin is closed or empty (e.g. a scripted run), so there is
+                # no one to choose a session
+                logger.error("No session given; pass the session ID as an argument")
+                return
             except Exception as e:
                 print(f"Invalid input: {e}")
         
-        logger.info(f"Processing selected session: {session_id}")
+        logger.info("Processing selected session: %s", session_id)
     
     # Ask for password if needed
     password = None
-    try:
-        password_input = input("\nEnter password for password-protected PDFs (press Enter to skip): ").strip()
-        if password_input:
-            password = password_input
-            logger.info("Password provided for password-protected PDFs")
-        else:
+    if pdf_password:
+        password = pdf_password
+        logger.info("Password for password-protected PDFs taken from %s", PDF_PASSWORD_ENV_VAR)
+    elif args.no_password:
+        logger.info("No password provided - will fail on password-protected PDFs")
+    else:
+        try:
+            password_input = input("\nEnter password for password-protected PDFs (press Enter to skip): ").strip()
+            if password_input:
+                password = password_input
+                logger.info("Password provided for password-protected PDFs")
+            else:
+                logger.info("No password provided - will fail on password-protected PDFs")
+        except KeyboardInterrupt:
+            print("\nOperation cancelled.")
+            return
+        except EOFError:
+            # No input to read (e.g. stdin redirected from /dev/null): skip
             logger.info("No password provided - will fail on password-protected PDFs")
-    except KeyboardInterrupt:
-        print("\nOperation cancelled.")
-        return
     
-    # Ask for bank selection
+    # Ask for bank selection unless it was given on the command line
     bank_name = None
-    try:
-        print(f"\n🏦 Bank Selection:")
-        print("Available banks: HDFC, ICICI, SBI")
-        print("Options:")
-        print("  1. HDFC")
-        print("  2. ICICI") 
-        print("  3. SBI")
-        print("  4. Auto-detect (recommended)")
-        
-        bank_choice = input("Enter bank number (1-4) or bank name (press Enter for auto-detect): ").strip()
-        
-        if bank_choice == "1" or bank_choice.upper() == "HDFC":
-            bank_name = "HDFC"
-        elif bank_choice == "2" or bank_choice.upper() == "ICICI":
-            bank_name = "ICICI"
-        elif bank_choice == "3" or bank_choice.upper() == "SBI":
-            bank_name = "SBI"
-        elif bank_choice == "4" or bank_choice.upper() == "AUTO" or bank_choice == "":
-            bank_name = None  # Auto-detect
-        else:
-            logger.warning(f"Invalid bank choice '{bank_choice}', using auto-detect")
-            bank_name = None
+    if args.bank:
+        bank_name = None if args.bank == "AUTO" else args.bank
+    else:
+        try:
+            print(f"\n🏦 Bank Selection:")
+            print("Available banks: HDFC, ICICI, SBI")
+            print("Options:")
+            print("  1. HDFC")
+            print("  2. ICICI") 
+            print("  3. SBI")
+            print("  4. Auto-detect (recommended)")
             
-        if bank_name:
-            logger.info(f"Selected bank: {bank_name}")
-        else:
-            logger.info("Using auto-detection for bank selection")
+            bank_choice = input("Enter bank number (1-4) or bank name (press Enter for auto-detect): ").strip()
             
-    except KeyboardInterrupt:
-        print("\nOperation cancelled.")
-        return
+            if bank_choice == "1" or bank_choice.upper() == "HDFC":
+                bank_name = "HDFC"
+            elif bank_choice == "2" or bank_choice.upper() == "ICICI":
+                bank_name = "ICICI"
+            elif bank_choice == "3" or bank_choice.upper() == "SBI":
+                bank_name = "SBI"
+            elif bank_choice == "4" or bank_choice.upper() == "AUTO" or bank_choice == "":
+                bank_name = None  # Auto-detect
+            else:
+                logger.warning("Invalid bank choice '%s', using auto-detect", bank_choice)
+                bank_name = None
+                
+        except KeyboardInterrupt:
+            print("\nOperation cancelled.")
+            return
+        except EOFError:
+            # No input to read: auto-detect, as for an empty answer
+            bank_name = None
     
-    # Validate session exists
-    if not processor.session_exists(session_id):
-        logger.error(f"Session '{session_id}' does not exist!")
-        logger.info(f"Available sessions: {', '.join(sessions)}")
-        return
+    if bank_name:
+        logger.info("Selected bank: %s", bank_name)
+    else:
+        logger.info("Using auto-detection for bank selection")
     
+    # Only the processing call is guarded so that errors while reporting or
+    # saving the result are not mistaken for processing failures
     try:
         result = processor.process_session(session_id, password, bank_name)
-        
-        if result["success"]:
-            logger.info(f"✓ Successfully processed {result['pdfs_processed']} PDFs")
-            logger.info(f"  Total pages: {result['combined_data']['total_pages']}")
-            logger.info(f"  Total text length: {result['combined_data']['total_text_length']} characters")
-            logger.info(f"  Total tables: {result['combined_data']['total_tables']}")
-            logger.info(f"  Total images: {result['combined_data']['total_images']}")
-            
-            # Show bank-specific information
-            if "bank_name" in result:
-                logger.info(f"  Bank detected/used: {result['bank_name']}")
-            if "total_formatted_transactions" in result:
-                logger.info(f"  Formatted transactions: {result['total_formatted_transactions']}")
-            
-            # Show balance validation report
-            if "bank_specific_data" in result and result["bank_specific_data"]:
-                bank_data = result["bank_specific_data"]
-                if bank_data.get("success") and bank_data.get("transactions"):
-                    from balance_validator import format_balance_validation_report
-                    bank_name = bank_data.get("bank_name", "Unknown")
-                    transactions = bank_data.get("transactions", [])
-                    balance_report = format_balance_validation_report(transactions, bank_name)
-                    print(balance_report)
-            
-            # Save results
-            output_file = f"session_results_{session_id}.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            logger.info(f"Results saved to: {output_file}")
-            
-            # Show sample transactions if available
-            if "formatted_transactions" in result and result["formatted_transactions"]:
-                logger.info(f"\n📋 Sample Transactions (first 3):")
-                for i, transaction in enumerate(result["formatted_transactions"][:3]):
-                    logger.info(f"  {i+1}. {transaction.get('date', 'N/A')} - {transaction.get('narration', 'N/A')} - {transaction.get('amount', 'N/A')} ({transaction.get('type', 'N/A')})")
-            
-        else:
-            logger.error(f"✗ Processing failed: {result.get('error', 'Unknown error')}")
-            
-    except Exception as e:
-        logger.error(f"Error: {str(e)}")
+    except (OSError, ValueError, RuntimeError):
+        logger.exception("Processing failed for session %s", session_id)
+        return
+    
+    if not result["success"]:
+        logger.error("✗ Processing failed: %s", result.get('error', 'Unknown error'))
+        return
+    
+    combined_data = result['combined_data']
+    logger.info("✓ Successfully processed %d PDFs", result['pdfs_processed'])
+    logger.info("  Total pages: %d | text: %d characters | tables: %d | images: %d",
+                combined_data['total_pages'], combined_data['total_text_length'],
+                combined_data['total_tables'], combined_data['total_images'])
+    
+    # Show bank-specific information
+    if "bank_name" in result:
+        logger.info("  Bank detected/used: %s", result['bank_name'])
+    if "total_formatted_transactions" in result:
+        logger.info("  Formatted transactions: %d", result['total_formatted_transactions'])
+    
+    # Show balance validation report
+    if "bank_specific_data" in result and result["bank_specific_data"]:
+        bank_data = result["bank_specific_data"]
+        if bank_data.get("success") and bank_data.get("transactions"):
+            from balance_validator import format_balance_validation_report
+            bank_name = bank_data.get("bank_name", "Unknown")
+            transactions = bank_data.get("transactions", [])
+            balance_report = format_balance_validation_report(transactions, bank_name)
+            print(balance_report)
+    
+    # Save results
+    if processor.compress_results:
+        output_file = f"session_results_{session_id}.json.gz"
+        with gzip.open(output_file, "wb", compresslevel=RESULTS_GZIP_LEVEL) as f:
+            _write_json(f, result, compact=True)
+    else:
+        output_file = f"session_results_{session_id}.json"
+        with open(output_file, "wb") as f:
+            _write_json(f, result)
+    logger.info("Results saved to: %s", output_file)
+    
+    # Show sample transactions if available
+    if "formatted_transactions" in result and result["formatted_transactions"]:
+        logger.info("\n📋 Sample Transactions (first 3):")
+        for i, transaction in enumerate(result["formatted_transactions"][:3]):
+            logger.info("  %s. %s - %s - %s (%s)", i + 1, transaction.get('date', 'N/A'), transaction.get('narration', 'N/A'), transaction.get('amount', 'N/A'), transaction.get('type', 'N/A'))
 
 
 if __name__ == "__main__":
@@ -17,12 +17,18 @@ Author: CredNX Team
 
 import logging
 from typing import Optional, Tuple
-import fitz  # PyMuPDF
-import PyPDF2
 from io import BytesIO
 
+# fitz is imported inside the methods that use it so importing this module
+# stays cheap; PyPDF2 is only imported when PyMuPDF can't open a file
+
 logger = logging.getLogger(__name__)
 
+# Every PDF starts with this marker; readers accept it anywhere in the first
+# 1024 bytes, so files with a little leading junk still count as PDFs
+PDF_HEADER = b"%PDF-"
+PDF_HEADER_SEARCH_BYTES = 1024
+
 
 class PDFPasswordHandler:
     """
@@ -38,15 +44,23 @@ class PDFPasswordHandler:
             pdf_content: PDF content as bytes
             
         Returns:
-            bool: True if PDF is password protected, False otherwise
+            bool: True if PDF is password protected, False otherwise (including
+            content that isn't a PDF at all)
         """
+        # Truncated uploads and HTML error pages saved as .pdf aren't
+        # protected PDFs; don't import or run two parsers to find that out
+        if PDF_HEADER not in pdf_content[:PDF_HEADER_SEARCH_BYTES]:
+            logger.info("Content has no PDF header, not checking for password protection")
+            return False
+        
+        import fitz  # PyMuPDF
+        
         try:
             # Method 1: Try PyMuPDF (fitz)
             try:
-                doc = fitz.open(stream=pdf_content, filetype="pdf")
-                # Check if document needs password
-                needs_pass = doc.needs_pass
-                doc.close()
+                with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+                    # Check if document needs password
+                    needs_pass = doc.needs_pass
                 logger.info(f"PyMuPDF check: needs_pass = {needs_pass}")
                 return needs_pass
             except Exception as e:
@@ -59,8 +73,11 @@ class PDFPasswordHandler:
                 # Other errors might indicate corruption or other issues
                 logger.warning(f"PyMuPDF error (might be password protected): {str(e)}")
             
-            # Method 2: Try PyPDF2 as backup
+            # Method 2: Try PyPDF2 as backup, only imported when PyMuPDF
+            # couldn't open the file
             try:
+                import PyPDF2
+                
                 pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
                 is_encrypted = pdf_reader.is_encrypted
                 logger.info(f"PyPDF2 check: is_encrypted = {is_encrypted}")
@@ -87,42 +104,44 @@ class PDFPasswordHandler:
         Returns:
             Tuple of (success, unlocked_content, error_message)
         """
+        import fitz  # PyMuPDF
+        
         logger.info(f"Attempting to unlock PDF with password (length: {len(password)})")
         
         try:
             # Method 1: Try PyMuPDF (fitz) first
             try:
-                doc = fitz.open(stream=pdf_content, filetype="pdf")
-                logger.info(f"PyMuPDF: Document opened, needs_pass = {doc.needs_pass}")
-                
-                # Check if document is encrypted
-                if doc.needs_pass:
-                    logger.info("PDF is encrypted, attempting authentication...")
-                    # Try to authenticate with password
-                    auth_result = doc.authenticate(password)
-                    logger.info(f"Authentication result: {auth_result}")
+                with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+                    logger.info(f"PyMuPDF: Document opened, needs_pass = {doc.needs_pass}")
                     
-                    if auth_result:
-                        logger.info("Successfully unlocked PDF with PyMuPDF")
-                        # Get the unlocked content
-                        unlocked_content = doc.write()
-                        doc.close()
-                        return True, unlocked_content, None
+                    # Check if document is encrypted
+                    if doc.needs_pass:
+                        logger.info("PDF is encrypted, attempting authentication...")
+                        # Try to authenticate with password
+                        auth_result = doc.authenticate(password)
+                        logger.info(f"Authentication result: {auth_result}")
+                        
+                        if auth_result:
+                            logger.info("Successfully unlocked PDF with PyMuPDF")
+                            # Get the unlocked content
+                            unlocked_content = doc.write()
+                            return True, unlocked_content, None
+                        else:
+                            logger.error("PyMuPDF authentication failed - invalid password")
+                            return False, None, "Invalid password provided"
                     else:
-                        doc.close()
-                        logger.error("PyMuPDF authentication failed - invalid password")
-                        return False, None, "Invalid password provided"
-                else:
-                    # Document is not encrypted
-                    logger.info("PDF is not encrypted according to PyMuPDF")
-                    doc.close()
-                    return True, pdf_content, None
+                        # Document is not encrypted
+                        logger.info("PDF is not encrypted according to PyMuPDF")
+                        return True, pdf_content, None
                     
             except Exception as e:
                 logger.warning(f"PyMuPDF unlock failed: {str(e)}")
             
-            # Method 2: Try PyPDF2 as backup
+            # Method 2: Try PyPDF2 as backup, only imported when PyMuPDF
+            # couldn't open the file
             try:
+                import PyPDF2
+                
                 pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
                 logger.info(f"PyPDF2: Document opened, is_encrypted = {pdf_reader.is_encrypted}")
                 
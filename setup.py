@@ -1,75 +1,11 @@
 #!/usr/bin/env python3
 """
 Setup script for BankParser ePDF processing library
-"""
-
-from setuptools import setup, find_packages
-import os
 
-# Read the README file
-def read_readme():
-    readme_path = os.path.join(os.path.dirname(__file__), 'README.md')
-    if os.path.exists(readme_path):
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    return "BankParser ePDF processing library"
+Package metadata and dependencies are declared in pyproject.toml; this stub
+only keeps legacy `python setup.py ...` invocations working.
+"""
 
-# Read requirements
-def read_requirements():
-    requirements_path = os.path.join(os.path.dirname(__file__), 'requirements.txt')
-    if os.path.exists(requirements_path):
-        with open(requirements_path, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
-    return []
+from setuptools import setup
 
-setup(
-    name="bankparser",
-    version="1.0.0",
-    author="BankParser Team",
-    author_email="team@bankparser.com",
-    description="ePDF processing library for S3 integration and data extraction",
-    long_description=read_readme(),
-    long_description_content_type="text/markdown",
-    url="https://github.com/bankparser/bankparser",
-    packages=find_packages(),
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: Developers",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Topic :: Software Development :: Libraries :: Python Modules",
-        "Topic :: Text Processing :: Markup",
-        "Topic :: Internet :: WWW/HTTP :: Dynamic Content",
-    ],
-    python_requires=">=3.8",
-    install_requires=read_requirements(),
-    extras_require={
-        "dev": [
-            "pytest>=7.0.0",
-            "pytest-cov>=4.0.0",
-            "black>=22.0.0",
-            "flake8>=5.0.0",
-            "mypy>=1.0.0",
-        ],
-        "docs": [
-            "sphinx>=5.0.0",
-            "sphinx-rtd-theme>=1.0.0",
-        ],
-    },
-    entry_points={
-        "console_scripts": [
-            "bankparser=example_usage:main",
-        ],
-    },
-    keywords="pdf, s3, aws, data-extraction, epdf, document-processing",
-    project_urls={
-        "Bug Reports": "https://github.com/bankparser/bankparser/issues",
-        "Source": "https://github.com/bankparser/bankparser",
-        "Documentation": "https://bankparser.readthedocs.io/",
-    },
-)
+setup()
@@ -0,0 +1,17 @@
+"""
+Shared pytest fixtures
+"""
+
+import boto3
+import pytest
+from moto import mock_aws
+
+
+@pytest.fixture(scope="session")
+def s3_bucket():
+    """Serve S3 in-process with moto, with test-bucket holding one session's ePDF"""
+    with mock_aws():
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        s3_client.create_bucket(Bucket='test-bucket')
+        s3_client.put_object(Bucket='test-bucket', Key='epdfs/test-session.pdf', Body=b"fake pdf content")
+        yield 'test-bucket'
@@ -7,11 +7,14 @@ import json
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
 import boto3
-from botocore.exceptions import ClientError
 
+import config
+import epdf_processor
+from bank_formatters_main import auto_detect_bank
 from epdf_processor import EPdfProcessor
 
 
+@pytest.mark.usefixtures("s3_bucket")
 class TestEPdfProcessor:
     """Test cases for EPdfProcessor class"""
     
@@ -23,40 +26,23 @@ class TestEPdfProcessor:
             region_name="us-east-1"
         )
     
-    @patch('boto3.client')
-    def test_init_success(self, mock_boto_client):
+    def test_init_success(self):
         """Test successful initialization"""
-        mock_s3_client = Mock()
-        mock_boto_client.return_value = mock_s3_client
-        
         processor = EPdfProcessor()
         
-        mock_boto_client.assert_called_once_with(
-            's3',
-            aws_access_key_id=None,
-            aws_secret_access_key=None,
-            region_name='us-east-1'
-        )
-        assert processor.s3_client == mock_s3_client
+        assert processor.s3_client.meta.region_name == 'us-east-1'
     
-    @patch('boto3.client')
-    def test_init_with_credentials(self, mock_boto_client):
+    def test_init_with_credentials(self):
         """Test initialization with custom credentials"""
-        mock_s3_client = Mock()
-        mock_boto_client.return_value = mock_s3_client
-        
         processor = EPdfProcessor(
             aws_access_key_id="custom_key",
             aws_secret_access_key="custom_secret",
             region_name="us-west-2"
         )
         
-        mock_boto_client.assert_called_once_with(
-            's3',
-            aws_access_key_id="custom_key",
-            aws_secret_access_key="custom_secret",
-            region_name="us-west-2"
-        )
+        assert processor.s3_client.meta.region_name == 'us-west-2'
+        credentials = processor.s3_client._request_signer._credentials
+        assert credentials.access_key == "custom_key"
     
     @patch('boto3.client')
     def test_init_no_credentials(self, mock_boto_client):
@@ -70,86 +56,96 @@ class TestEPdfProcessor:
     
     def test_get_epdf_from_s3_success(self):
         """Test successful ePDF retrieval from S3"""
-        mock_response = {
-            'Body': Mock()
-        }
-        mock_response['Body'].read.return_value = b"fake pdf content"
-        
-        self.processor.s3_client.get_object.return_value = mock_response
-        
         result = self.processor.get_epdf_from_s3("test-bucket", "test-session")
         
         assert result == b"fake pdf content"
-        self.processor.s3_client.get_object.assert_called_once_with(
-            Bucket="test-bucket",
-            Key="epdfs/test-session.pdf"
-        )
     
-    def test_get_epdf_from_s3_no_such_key(self):
-        """Test ePDF retrieval when file doesn't exist"""
-        error_response = {
-            'Error': {
-                'Code': 'NoSuchKey',
-                'Message': 'The specified key does not exist.'
-            }
-        }
+    def test_get_epdf_from_s3_cache_hit(self):
+        """Test that an unchanged ePDF is answered from the cache by a conditional GET"""
+        processor = EPdfProcessor(s3_body_cache_bytes=1024)
+        s3_client = processor.s3_client
+        with patch.object(s3_client, 'get_object', wraps=s3_client.get_object) as mock_get:
+            first = processor.get_epdf_from_s3("test-bucket", "test-session")
+            second = processor.get_epdf_from_s3("test-bucket", "test-session")
         
-        self.processor.s3_client.get_object.side_effect = ClientError(
-            error_response, 'GetObject'
+        assert first == second == b"fake pdf content"
+        assert mock_get.call_count == 2
+        assert 'IfNoneMatch' not in mock_get.call_args_list[0].kwargs
+        assert 'IfNoneMatch' in mock_get.call_args_list[1].kwargs
+    
+    def test_get_epdf_from_s3_cache_disabled(self):
+        """Test that downloaded ePDFs are not kept in memory by default"""
+        self.processor.get_epdf_from_s3("test-bucket", "test-session")
+        
+        assert not self.processor._s3_body_cache
+    
+    def test_get_epdf_from_s3_changed_object(self):
+        """Test that a changed ePDF is downloaded again"""
+        processor = EPdfProcessor(s3_body_cache_bytes=1024)
+        processor.get_epdf_from_s3("test-bucket", "test-session")
+        processor.s3_client.put_object(
+            Bucket="test-bucket", Key="epdfs/test-session.pdf", Body=b"updated pdf content"
         )
+        try:
+            assert processor.get_epdf_from_s3("test-bucket", "test-session") == b"updated pdf content"
+        finally:
+            processor.s3_client.put_object(
+                Bucket="test-bucket", Key="epdfs/test-session.pdf", Body=b"fake pdf content"
+            )
+    
+    @patch('epdf_processor.S3_MULTIPART_CHUNK_SIZE', 5)
+    def test_get_epdf_from_s3_multipart(self):
+        """Test that a large ePDF is reassembled from ranged GETs"""
+        assert self.processor.get_epdf_from_s3("test-bucket", "test-session") == b"fake pdf content"
+    
+    def test_get_epdf_from_s3_cache_size_bound(self):
+        """Test that bodies larger than the cache bound are not cached"""
+        processor = EPdfProcessor(s3_body_cache_bytes=4)
+        processor.get_epdf_from_s3("test-bucket", "test-session")
         
-        with pytest.raises(FileNotFoundError, match="ePDF not found for session_id: test-session"):
-            self.processor.get_epdf_from_s3("test-bucket", "test-session")
+        assert not processor._s3_body_cache
+    
+    def test_get_epdf_from_s3_no_such_key(self):
+        """Test ePDF retrieval when file doesn't exist"""
+        with pytest.raises(FileNotFoundError, match="ePDF not found for session_id: missing-session"):
+            self.processor.get_epdf_from_s3("test-bucket", "missing-session")
     
     def test_get_epdf_from_s3_no_such_bucket(self):
         """Test ePDF retrieval when bucket doesn't exist"""
-        error_response = {
-            'Error': {
-                'Code': 'NoSuchBucket',
-                'Message': 'The specified bucket does not exist.'
-            }
-        }
-        
-        self.processor.s3_client.get_object.side_effect = ClientError(
-            error_response, 'GetObject'
-        )
-        
-        with pytest.raises(FileNotFoundError, match="S3 bucket not found: test-bucket"):
-            self.processor.get_epdf_from_s3("test-bucket", "test-session")
+        with pytest.raises(FileNotFoundError, match="S3 bucket not found: missing-bucket"):
+            self.processor.get_epdf_from_s3("missing-bucket", "test-session")
     
     @patch('fitz.open')
-    @patch('pdfplumber.open')
-    def test_extract_data_from_epdf_success(self, mock_pdfplumber, mock_fitz):
+    def test_extract_data_from_epdf_success(self, mock_fitz):
         """Test successful data extraction from ePDF"""
         # Mock PyMuPDF
-        mock_doc = Mock()
+        mock_doc = MagicMock()
+        mock_doc.needs_pass = False
         mock_doc.metadata = {
             "title": "Test Document",
             "author": "Test Author",
             "creationDate": "2024-01-01"
         }
-        mock_doc.__len__ = Mock(return_value=2)
+        mock_doc.__len__.return_value = 2
+        mock_doc.__enter__.return_value = mock_doc
+        
+        # Tables come from PyMuPDF's find_tables on the same document
+        mock_table = Mock()
+        mock_table.extract.return_value = [["Header1", "Header2"], ["Value1", "Value2"]]
         
         mock_page1 = Mock()
-        mock_page1.get_text.return_value = "Page 1 content"
+        mock_page1.get_textpage.return_value.extractText.return_value = "Page 1 content"
+        mock_page1.find_tables.return_value = [mock_table]
         mock_page1.get_images.return_value = []
         
         mock_page2 = Mock()
-        mock_page2.get_text.return_value = "Page 2 content"
+        mock_page2.get_textpage.return_value.extractText.return_value = "Page 2 content"
+        mock_page2.find_tables.return_value = []
         mock_page2.get_images.return_value = []
         
-        mock_doc.__getitem__ = Mock(side_effect=[mock_page1, mock_page2])
+        mock_doc.pages.return_value = iter([mock_page1, mock_page2])
         mock_fitz.return_value = mock_doc
         
-        # Mock pdfplumber
-        mock_pdf = Mock()
-        mock_page = Mock()
-        mock_page.extract_tables.return_value = [
-            [["Header1", "Header2"], ["Value1", "Value2"]]
-        ]
-        mock_pdf.pages = [mock_page]
-        mock_pdfplumber.return_value.__enter__.return_value = mock_pdf
-        
         result = self.processor.extract_data_from_epdf(b"fake pdf content")
         
         assert result["pages_count"] == 2
@@ -158,30 +154,143 @@ class TestEPdfProcessor:
         assert "Page 1 content" in result["text_content"]
         assert "Page 2 content" in result["text_content"]
         assert len(result["tables"]) == 1
+        assert result["tables"][0]["page"] == 1
+        # Text, tables and images all come from one pass over the pages
+        mock_doc.pages.assert_called_once_with(0, 2)
+        mock_page1.find_tables.assert_called_once()
         assert result["tables"][0]["data"] == [["Header1", "Header2"], ["Value1", "Value2"]]
     
     @patch('fitz.open')
-    @patch('PyPDF2.PdfReader')
-    def test_extract_data_from_epdf_fallback(self, mock_pypdf2, mock_fitz):
+    @patch('pypdfium2.PdfDocument')
+    def test_extract_data_from_epdf_fallback(self, mock_pdfium, mock_fitz):
         """Test fallback extraction when PyMuPDF fails"""
         # Mock PyMuPDF failure
-        mock_fitz.side_effect = Exception("PyMuPDF failed")
+        mock_fitz.side_effect = RuntimeError("PyMuPDF failed")
         
-        # Mock PyPDF2 fallback
-        mock_reader = Mock()
-        mock_reader.pages = [Mock(), Mock()]
+        # Mock PDFium fallback
+        mock_pdf = MagicMock()
+        mock_pdf.__len__.return_value = 2
         mock_page = Mock()
-        mock_page.extract_text.return_value = "Fallback text content"
-        mock_reader.pages.__getitem__ = Mock(return_value=mock_page)
-        mock_pypdf2.return_value = mock_reader
+        mock_page.get_textpage.return_value.get_text_range.return_value = "Fallback text content"
+        mock_pdf.__getitem__.return_value = mock_page
+        mock_pdfium.return_value = mock_pdf
         
         result = self.processor.extract_data_from_epdf(b"fake pdf content")
         
         assert result["pages_count"] == 2
-        assert result["extraction_method"] == "fallback_pypdf2"
+        assert result["extraction_method"] == "fallback_pdfium"
         assert "Fallback text content" in result["text_content"]
     
-    @patch('epdf_processor.EPdfProcessor.extract_data_from_epdf')
+    def test_extract_data_from_epdf_short_last_page(self):
+        """Test that a short closing page does not make a text PDF look scanned"""
+        import fitz  # PyMuPDF
+        
+        with fitz.open() as doc:
+            page = doc.new_page()
+            for line in range(10):
+                page.insert_text((72, 72 + line * 14), f"01-04-2024 UPI/ICICI/{line:04d} 1,250.00 93,498.86")
+            doc.new_page().insert_text((72, 72), "Page 2 of 2 - End of statement")
+            pdf_content = doc.tobytes()
+        
+        result = self.processor.extract_data_from_epdf(pdf_content)
+        
+        assert result["extraction_method"] == "multiple"
+        assert "UPI/ICICI/0009" in result["text_content"]
+        assert "End of statement" in result["text_content"]
+        
+        # Pages without any text are still skipped as scanned
+        with fitz.open() as doc:
+            doc.new_page()
+            doc.new_page()
+            blank_content = doc.tobytes()
+        
+        result = self.processor.extract_data_from_epdf(blank_content)
+        
+        assert result["extraction_method"] == "skipped_scanned"
+        assert result["text_content"] == ""
+    
+    def test_extract_parallel(self):
+        """Test that large documents are extracted in the page pool, in page order"""
+        import fitz  # PyMuPDF
+        
+        pages_count = epdf_processor.PARALLEL_MIN_PAGES + 4
+        with fitz.open() as doc:
+            for page_num in range(1, pages_count + 1):
+                page = doc.new_page()
+                page.insert_text((72, 72), f"Statement page {page_num} " + "transaction line " * 5)
+            pdf_content = doc.tobytes()
+        
+        with patch.object(self.processor, '_extract_pages_parallel',
+                          wraps=self.processor._extract_pages_parallel) as mock_parallel:
+            result = self.processor.extract_data_from_epdf(pdf_content)
+        
+        # The first pages are extracted in-process by the text-layer pre-flight
+        mock_parallel.assert_called_once_with(pdf_content, epdf_processor.TEXT_LAYER_SAMPLE_PAGES, pages_count)
+        assert result["pages_count"] == pages_count
+        assert result["extraction_method"] == "multiple"
+        positions = [result["text_content"].index(f"Statement page {page_num} ") for page_num in range(1, pages_count + 1)]
+        assert positions == sorted(positions)
+    
+    @patch('epdf_processor.shared_memory.SharedMemory', side_effect=FileNotFoundError("/dev/shm"))
+    def test_extract_parallel_without_shared_memory(self, mock_shm):
+        """Test that large documents are extracted serially when the page pool can't start"""
+        import fitz  # PyMuPDF
+        
+        pages_count = epdf_processor.PARALLEL_MIN_PAGES + 4
+        with fitz.open() as doc:
+            for page_num in range(1, pages_count + 1):
+                doc.new_page().insert_text((72, 72), f"Statement page {page_num} ")
+            pdf_content = doc.tobytes()
+        
+        result = self.processor.extract_data_from_epdf(pdf_content)
+        
+        mock_shm.assert_called_once()
+        assert result["extraction_method"] == "multiple"
+        assert result["text_content"].endswith(f"Statement page {pages_count}")
+    
+    @patch('fitz.Page.find_tables', side_effect=ValueError("malformed page"))
+    def test_extract_data_from_epdf_malformed_page(self, mock_find_tables):
+        """Test that a page find_tables can't parse falls back to PDFium"""
+        import fitz  # PyMuPDF
+        
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 72), "Statement page 1")
+            pdf_content = doc.tobytes()
+        
+        result = self.processor.extract_data_from_epdf(pdf_content)
+        
+        assert result["extraction_method"] == "fallback_pdfium"
+        assert "Statement page 1" in result["text_content"]
+    
+    def test_extract_data_from_epdf_password_error(self):
+        """Test that password errors are raised rather than falling back"""
+        import fitz  # PyMuPDF
+        
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 72), "Statement page 1")
+            pdf_content = doc.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="secret", owner_pw="owner")
+        
+        with pytest.raises(ValueError, match="Invalid password"):
+            self.processor.extract_data_from_epdf(pdf_content, password="wrong")
+    
+    def test_iter_pages(self):
+        """Test page-by-page extraction of a real PDF"""
+        import fitz  # PyMuPDF
+        
+        with fitz.open() as doc:
+            for page_num in range(1, 4):
+                doc.new_page().insert_text((72, 72), f"Statement page {page_num}")
+            pdf_content = doc.tobytes()
+        
+        pages = self.processor.iter_pages(pdf_content)
+        first = next(pages)
+        assert first["page_num"] == 1
+        assert "Statement page 1" in first["text"]
+        assert first["tables"] == []
+        assert first["images"] == []
+        assert [page["page_num"] for page in pages] == [2, 3]
+    
+    @patch('epdf_processor.EPdfProcessor.extract_data_with_cache')
     @patch('epdf_processor.EPdfProcessor.get_epdf_from_s3')
     def test_process_epdf_success(self, mock_get_epdf, mock_extract_data):
         """Test successful complete ePDF processing"""
@@ -194,8 +303,8 @@ class TestEPdfProcessor:
             "images_info": []
         }
         
-        with patch('pandas.Timestamp') as mock_timestamp:
-            mock_timestamp.now.return_value = "2024-01-01T12:00:00"
+        with patch('epdf_processor.datetime') as mock_datetime:
+            mock_datetime.now.return_value.isoformat.return_value = "2024-01-01T12:00:00"
             
             result = self.processor.process_epdf("test-bucket", "test-session")
         
@@ -205,7 +314,58 @@ class TestEPdfProcessor:
         assert result["processing_timestamp"] == "2024-01-01T12:00:00"
         
         mock_get_epdf.assert_called_once_with("test-bucket", "test-session")
-        mock_extract_data.assert_called_once_with(b"fake pdf content")
+        mock_extract_data.assert_called_once_with(b"fake pdf content", None)
+
+        assert result["schema_version"] == epdf_processor.OUTPUT_SCHEMA_VERSION
+    
+    @patch('epdf_processor.EPdfProcessor.extract_data_with_cache')
+    def test_process_epdf_legacy_output(self, mock_extract_data):
+        """Test that legacy output lists images_info as one dict per image"""
+        images_info = {field: [None, None] for field in epdf_processor.IMAGE_INFO_FIELDS}
+        images_info["page"] = [1, 2]
+        images_info["xref"] = [7, 9]
+        mock_extract_data.return_value = {
+            "pages_count": 2,
+            "text_content": "Test content",
+            "metadata": {},
+            "tables": [],
+            "images_info": images_info
+        }
+        
+        processor = EPdfProcessor(legacy_output=True)
+        result = processor._process_epdf_content("test-bucket", "test-session", b"fake pdf content")
+        
+        assert result["schema_version"] == epdf_processor.LEGACY_OUTPUT_SCHEMA_VERSION
+        assert [image["page"] for image in result["images_info"]] == [1, 2]
+        assert [image["xref"] for image in result["images_info"]] == [7, 9]
+    
+    @patch('epdf_processor.EPdfProcessor.extract_data_from_epdf')
+    def test_extract_data_with_cache(self, mock_extract_data, tmp_path):
+        """Test that identical PDF content is only extracted once"""
+        mock_extract_data.return_value = {
+            "pages_count": 1,
+            "text_content": "Cached content",
+            "metadata": {},
+            "tables": [],
+            "images_info": []
+        }
+        self.processor.cache_dir = str(tmp_path)
+        
+        first = self.processor.extract_data_with_cache(b"fake pdf content")
+        second = self.processor.extract_data_with_cache(b"fake pdf content")
+        
+        assert first == second
+        assert second["text_content"] == "Cached content"
+        mock_extract_data.assert_called_once()
+        
+        # A different password must not hit the same cache entry
+        self.processor.extract_data_with_cache(b"fake pdf content", "secret")
+        assert mock_extract_data.call_count == 2
+        
+        # Expired entries are extracted again
+        self.processor.cache_ttl_seconds = -1
+        self.processor.extract_data_with_cache(b"fake pdf content")
+        assert mock_extract_data.call_count == 3
     
     @patch('epdf_processor.EPdfProcessor.get_epdf_from_s3')
     def test_process_epdf_failure(self, mock_get_epdf):
@@ -216,9 +376,24 @@ class TestEPdfProcessor:
             self.processor.process_epdf("test-bucket", "test-session")
 
 
+class TestAutoDetectBank:
+    """Test cases for auto_detect_bank"""
+    
+    def test_detection_priority(self):
+        """Test that banks are matched in priority order over the whole text"""
+        header = "NEFT transfer from ICICI BANK account\n" + "01/04/2024 Opening balance\n" * 300
+        assert auto_detect_bank(header + "HDFC BANK LTD - Statement of account") == "HDFC"
+        assert auto_detect_bank(header) == "ICICI"
+        assert auto_detect_bank("Statement of account") is None
+
+
 class TestConfig:
     """Test cases for Config class"""
     
+    def teardown_method(self):
+        """Re-read the configuration from the unpatched environment"""
+        config.Config.reload()
+    
     def test_config_validation_success(self):
         """Test successful configuration validation"""
         with patch.dict('os.environ', {
@@ -226,14 +401,15 @@ class TestConfig:
             'AWS_SECRET_ACCESS_KEY': 'test_secret',
             'S3_BUCKET_NAME': 'test-bucket'
         }):
-            from config import Config
-            assert Config.validate() is True
+            # Settings are cached on first access, so drop earlier values
+            config.Config.reload()
+            assert config.Config.validate() is True
     
     def test_config_validation_failure(self):
         """Test configuration validation failure"""
         with patch.dict('os.environ', {}, clear=True):
-            from config import Config
-            assert Config.validate() is False
+            config.Config.reload()
+            assert config.Config.validate() is False
     
     def test_config_print(self):
         """Test configuration printing"""
@@ -246,9 +422,20 @@ class TestConfig:
             'LOG_LEVEL': 'DEBUG',
             'AWS_ACCESS_KEY_ID': 'test_key'
         }):
-            from config import Config
+            config.Config.reload()
             # This test just ensures the method doesn't raise an exception
-            Config.print_config()
+            config.Config.print_config()
+    
+    def test_config_lazy_resolution(self):
+        """Test that settings are parsed on first access and cached"""
+        with patch.dict('os.environ', {'MAX_FILE_SIZE_MB': '200', 'COMPRESS_RESULTS': 'true'}):
+            config.Config.reload()
+            assert config.Config.MAX_FILE_SIZE_MB == 200
+            assert config.Config.COMPRESS_RESULTS is True
+        
+        # The environment is back to normal, but the cached values remain
+        assert config.Config.MAX_FILE_SIZE_MB == 200
+        assert config.Config().COMPRESS_RESULTS is True
 
 
 if __name__ == "__main__":
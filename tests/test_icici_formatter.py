@@ -0,0 +1,116 @@
+"""
+Unit tests for ICICIFormatter
+"""
+
+import re
+
+import pytest
+
+from bank_formatters.icici_formatter import (
+    ICICIFormatter, LINE_AMOUNT, LINE_DATE, LINE_EMPTY, LINE_PAGE, LINE_TEXT, LINE_TXID
+)
+
+
+# Two statement pages as extracted from a PDF: text before the first page
+# marker is indented, and the column header repeats on the second page
+ICICI_STATEMENT = """ICICI BANK LIMITED
+Statement of Transactions
+  DATE  
+MODE**
+PARTICULARS
+DEPOSITS
+WITHDRAWALS
+BALANCE
+ 01-09-2024 
+B/F
+10,000.00
+02-09-2024
+MOBILE BANKING/UPI/MERCHANT
+PAYMENT
+4567
+2,500.00
+7,500.00
+Page 1 of 2
+DATE
+MODE**
+PARTICULARS
+DEPOSITS
+WITHDRAWALS
+BALANCE
+03-09-2024
+NEFT/SALARY/ACME CORP
+1,00,000.00
+770593868
+1,07,500.00
+04-09-2024
+BANK CHARGES/SMS
+59
+1,07,441.00
+05-09-2024
+ICICI ATM/CASH WITHDRAWAL
+1234567890123
+5000.0
+1,02,441.00
+Page 2 of 2
+"""
+
+
+class TestICICIFormatter:
+    """Test cases for ICICIFormatter"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.formatter = ICICIFormatter()
+    
+    def test_parse_statement_format(self):
+        """Test parsing transactions across the page-header boundary"""
+        transactions = self.formatter.parse_statement_format(ICICI_STATEMENT)
+        
+        parsed = [
+            (tx["date"], tx["mode"], tx["particulars"], tx["deposits"], tx["withdrawals"], tx["balance"])
+            for tx in transactions
+        ]
+        assert parsed == [
+            ("01-09-2024", "", "B/F", 0.0, 0.0, 10000.0),
+            # Transaction IDs before the first amount stay in the particulars
+            ("02-09-2024", "MOBILE BANKING", "MOBILE BANKING/UPI/MERCHANT PAYMENT 4567", 0.0, 2500.0, 7500.0),
+            # ... while those between amounts are skipped
+            ("03-09-2024", "", "NEFT/SALARY/ACME CORP", 100000.0, 0.0, 107500.0),
+            ("04-09-2024", "BANK CHARGES", "BANK CHARGES/SMS", 0.0, 59.0, 107441.0),
+            # 13+ digit numbers are text, not amounts
+            ("05-09-2024", "ICICI ATM", "ICICI ATM/CASH WITHDRAWAL 1234567890123", 0.0, 5000.0, 102441.0),
+        ]
+    
+    def test_format_transactions(self):
+        """Test the clean 6-column output"""
+        result = self.formatter.format_transactions(ICICI_STATEMENT)
+        
+        assert result["success"] is True
+        assert result["total_transactions"] == 5
+        assert set(result["transactions"][0]) == {
+            "date", "mode", "particulars", "deposits", "withdrawals", "balance"
+        }
+    
+    @pytest.mark.parametrize("line", [
+        "", "   ", "B/F", "MOBILE BANKING/UPI/MERCHANT",
+        "Page 1 of 2", "Statement Page 12 of 30 continued", " 01-09-2024 ", "01-09-2024 B/F 93,498.86",
+        "59", "123", "4567", "57065", "770593868", "202412220504", "1234567890123",
+        "5000.0", "78,410.00", "1,71,908.86", "12,34", "1,2", "10.123",
+    ])
+    def test_classify_line_matches_predicates(self, line):
+        """Test that the fused line classifier agrees with the per-kind checks"""
+        stripped = line.strip()
+        if not stripped:
+            expected = LINE_EMPTY
+        elif re.search(r'Page \d+ of \d+', stripped):
+            expected = LINE_PAGE
+        elif re.match(r'\d{2}-\d{2}-\d{4}', stripped):
+            expected = LINE_DATE
+        elif self.formatter._is_transaction_id(stripped):
+            expected = LINE_TXID
+        elif self.formatter._is_amount_line(stripped):
+            expected = LINE_AMOUNT
+        else:
+            expected = LINE_TEXT
+        
+        assert self.formatter._classify_line(line) == expected